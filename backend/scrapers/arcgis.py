@@ -0,0 +1,137 @@
+"""
+ArcGIS FeatureServer fetch engine - snapshots the matching object IDs with a
+single returnIdsOnly query, then fetches them in maxRecordCount-sized chunks
+concurrently with objectIds=
+"""
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+
+
+class ArcGISFetcher:
+    """Parallel objectId-chunked pager for a single FeatureServer layer"""
+
+    def __init__(self, fetch, query_url, max_workers=4, logger=None, fetch_records=None):
+        """
+        Args:
+            fetch: Callable taking (params, url=None, method='get') and returning
+                   the decoded JSON body (usually the scraper's _fetch_batch)
+            query_url: The layer's .../FeatureServer/<n>/query endpoint
+            max_workers: Maximum number of chunks in flight at once
+            logger: Optional logger instance
+            fetch_records: Optional callable taking (params, method='get') and
+                   returning the features' attribute dicts directly (e.g.
+                   stream-decoded), used for the chunk queries
+        """
+        self.fetch = fetch
+        self.fetch_records = fetch_records
+        self.query_url = query_url
+        self.layer_url = query_url.rsplit('/query', 1)[0]
+        self.max_workers = max_workers
+        self.logger = logger
+
+    def max_record_count(self, default=1000):
+        """Return the layer's maxRecordCount (rows the server returns per query)"""
+        try:
+            info = self.fetch({'f': 'json'}, url=self.layer_url)
+            return int(info.get('maxRecordCount') or default)
+        except Exception as e:
+            if self.logger:
+                self.logger.warning(f"Could not read maxRecordCount, using {default}: {e}")
+            return default
+
+    def object_ids(self, where):
+        """Return (objectIdFieldName, sorted object IDs) matching a where clause"""
+        data = self.fetch({'where': where, 'returnIdsOnly': 'true', 'f': 'json'})
+
+        if 'error' in data:
+            raise ValueError(f"ArcGIS error: {data['error'].get('message', data['error'])}")
+
+        id_field = data.get('objectIdFieldName', 'OBJECTID')
+        return id_field, sorted(data.get('objectIds') or [])
+
+    def iter_pages(self, where, out_fields='*', order_by=None, max_rows=None, params=None, start_page=0,
+                   cursor_store=None):
+        """
+        Yield pages of feature attribute dicts for a where clause
+
+        The ID snapshot makes the result deterministic even if the layer is
+        edited mid-scrape. ArcGIS ignores ordering on returnIdsOnly queries,
+        so when order_by is given the chunks are merged and sorted locally
+        before max_rows is applied.
+
+        Args:
+            where: SQL where clause
+            out_fields: outFields value
+            order_by: Optional "FIELD [ASC|DESC]" ordering
+            max_rows: Optional cap on the number of rows returned
+            params: Extra query parameters sent with every chunk
+            start_page: Number of leading pages to skip (resuming a run). With
+                        order_by every chunk is still fetched for the sort.
+            cursor_store: Optional fetch_cursor.CursorStore - chunks already
+                          fetched by an earlier run of this ID snapshot are
+                          read back from disk instead of refetched
+        """
+        _, ids = self.object_ids(where)
+        chunk_size = self.max_record_count()
+
+        if self.logger:
+            self.logger.info(f"ArcGIS layer matched {len(ids)} features - fetching in chunks of {chunk_size}")
+
+        if not ids:
+            return
+
+        if max_rows is not None and not order_by:
+            ids = ids[:max_rows]
+
+        chunks = [ids[i:i + chunk_size] for i in range(0, len(ids), chunk_size)]
+
+        cursor = None
+        if cursor_store is not None:
+            snapshot = hashlib.sha1(','.join(map(str, ids)).encode('utf-8')).hexdigest()
+            cursor = cursor_store.cursor(source='arcgis', url=self.query_url, where=where,
+                                         out_fields=out_fields, ids=snapshot, chunk_size=chunk_size,
+                                         params=params or {})
+            cursor.log_resume(len(chunks))
+
+        def fetch_chunk(index):
+            if cursor is not None:
+                return cursor.fetch(index, fetch_ids, chunks[index])
+            return fetch_ids(chunks[index])
+
+        def fetch_ids(chunk):
+            chunk_params = dict(params or {})
+            chunk_params.update({
+                'objectIds': ','.join(str(object_id) for object_id in chunk),
+                'outFields': out_fields,
+                'f': 'json',
+            })
+            # Long ID lists overflow GET URLs, so chunks are POSTed
+            if self.fetch_records:
+                return self.fetch_records(chunk_params, method='post')
+
+            data = self.fetch(chunk_params, method='post')
+            if 'error' in data:
+                raise ValueError(f"ArcGIS error: {data['error'].get('message', data['error'])}")
+            return [feature.get('attributes', {}) for feature in data.get('features', [])]
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            if not order_by:
+                for page in executor.map(fetch_chunk, range(start_page, len(chunks))):
+                    yield page
+                if cursor is not None:
+                    cursor.finish()
+                return
+
+            rows = [row for page in executor.map(fetch_chunk, range(len(chunks))) for row in page]
+
+        field, _, direction = order_by.partition(' ')
+        rows.sort(key=lambda row: (row.get(field) is not None, row.get(field) or 0),
+                  reverse=direction.strip().upper() == 'DESC')
+        if max_rows is not None:
+            rows = rows[:max_rows]
+
+        for i in range(start_page * chunk_size, len(rows), chunk_size):
+            yield rows[i:i + chunk_size]
+
+        if cursor is not None:
+            cursor.finish()
@@ -0,0 +1,166 @@
+"""
+Partitioned Parquet archive of historical permits
+
+The leads/ tree holds one CSV per city per day, so analytics over months of
+history re-parses every file. PermitArchive keeps permits as Parquet under
+archive/city=<City>/year=<YYYY>/month=<M>/ (year=0/month=0 when the issue
+date is unknown), with type/status dictionary encoded and value/issued_date
+stored as float64/date32. Reads are pushed down
+to the dataset: only the requested columns are decoded and only partitions
+matching the city and date filters are opened.
+
+pyarrow is only needed here and is imported when an archive is used, so
+scrapers run without it unless archiving is turned on
+(BaseScraper.archive_permits).
+"""
+import os
+import threading
+import uuid
+from datetime import datetime
+
+from batch_normalize import parse_valuations
+
+ARCHIVE_DIR = os.path.join(os.path.dirname(__file__), '../archive')
+
+DICTIONARY_COLUMNS = ['type', 'status']
+
+
+def _pyarrow():
+    import pyarrow
+    import pyarrow.dataset
+    return pyarrow, pyarrow.dataset
+
+
+def _to_date(value):
+    value = str(value or '')
+    try:
+        return datetime.strptime(value[:10], '%Y-%m-%d').date()
+    except ValueError:
+        return None
+
+
+class PermitArchive:
+    """Append-only Parquet dataset partitioned by city/year/month"""
+
+    def __init__(self, root=ARCHIVE_DIR):
+        self.root = root
+        pa, ds = _pyarrow()
+        self.schema = pa.schema([
+            ('permit_number', pa.string()),
+            ('address', pa.string()),
+            ('type', pa.dictionary(pa.int32(), pa.string())),
+            ('value', pa.float64()),
+            ('issued_date', pa.date32()),
+            ('status', pa.dictionary(pa.int32(), pa.string())),
+            ('city', pa.string()),
+            ('description', pa.string()),
+            ('year', pa.int16()),
+            ('month', pa.int8()),
+        ])
+        self.partitioning = ds.partitioning(
+            pa.schema([('city', pa.string()), ('year', pa.int16()), ('month', pa.int8())]),
+            flavor='hive'
+        )
+
+    def append(self, city, permits):
+        """
+        Write permits as new files in their city/year/month partitions
+
+        A permit delivered again after a change is appended again; readers
+        wanting one row per permit keep the latest file's row.
+
+        Args:
+            city: City name (the city partition)
+            permits: Permit records
+
+        Returns:
+            Number of rows written
+        """
+        if not permits:
+            return 0
+
+        pa, ds = _pyarrow()
+        dates = [_to_date(permit.issued_date) for permit in permits]
+        columns = {
+            'permit_number': [str(permit.permit_number) for permit in permits],
+            'address': [permit.address for permit in permits],
+            'type': [permit.type for permit in permits],
+            'value': parse_valuations([permit.value for permit in permits]),
+            'issued_date': dates,
+            'status': [permit.status for permit in permits],
+            'city': [city] * len(permits),
+            'description': [permit.description for permit in permits],
+            'year': [date.year if date else 0 for date in dates],
+            'month': [date.month if date else 0 for date in dates],
+        }
+        table = pa.Table.from_pydict(columns, schema=self.schema)
+
+        file_format = ds.ParquetFileFormat()
+        ds.write_dataset(
+            table, self.root, format=file_format, partitioning=self.partitioning,
+            basename_template=f"{datetime.now().strftime('%Y%m%d%H%M%S')}-{uuid.uuid4().hex[:8]}-{{i}}.parquet",
+            existing_data_behavior='overwrite_or_ignore',
+            file_options=file_format.make_write_options(
+                compression='zstd', use_dictionary=DICTIONARY_COLUMNS + ['permit_number']
+            ),
+        )
+        return table.num_rows
+
+    def dataset(self):
+        pa, ds = _pyarrow()
+        # Read with the current schema so files written before a column existed load it as null
+        return ds.dataset(self.root, schema=self.schema, format='parquet', partitioning=self.partitioning)
+
+    def read(self, columns=None, city=None, since=None, until=None, filter=None):
+        """
+        Read archived permits as a pyarrow Table
+
+        Args:
+            columns: Columns to load (default: all)
+            city: Only this city's partition
+            since / until: Inclusive YYYY-MM-DD bounds on issued_date; also
+                           prune year/month partitions outside the range
+            filter: Extra pyarrow.dataset expression to AND in
+
+        Returns:
+            pyarrow.Table
+        """
+        pa, ds = _pyarrow()
+        if not os.path.isdir(self.root):
+            return self.schema.empty_table().select(columns or self.schema.names)
+
+        conditions = []
+        if city is not None:
+            conditions.append(ds.field('city') == city)
+        if since:
+            start = _to_date(since)
+            conditions.append((ds.field('year') > start.year)
+                              | ((ds.field('year') == start.year) & (ds.field('month') >= start.month)))
+            conditions.append(ds.field('issued_date') >= pa.scalar(start, pa.date32()))
+        if until:
+            end = _to_date(until)
+            conditions.append((ds.field('year') < end.year)
+                              | ((ds.field('year') == end.year) & (ds.field('month') <= end.month)))
+            conditions.append(ds.field('issued_date') <= pa.scalar(end, pa.date32()))
+        if filter is not None:
+            conditions.append(filter)
+
+        expression = None
+        for condition in conditions:
+            expression = condition if expression is None else expression & condition
+
+        return self.dataset().to_table(columns=columns, filter=expression)
+
+
+_archive = None
+_archive_lock = threading.Lock()
+
+
+def get_permit_archive():
+    """Return the process-wide permit archive, creating it on first use"""
+    global _archive
+    if _archive is None:
+        with _archive_lock:
+            if _archive is None:
+                _archive = PermitArchive()
+    return _archive
@@ -3,67 +3,192 @@
 Base scraper class for city permit data collection
 """
 
-import requests
 import json
-import csv
 import os
 from datetime import datetime, timedelta
 from abc import ABC, abstractmethod
 import time
 import logging
+from collections import Counter
+from http_client import get_http_client
+from utils import STATE_DIR, HighWaterMark, ScraperHealthCheck, get_circuit_breaker
+from date_parser import DateParser
+from permit import Permit
+from schema import PermitSerializer
+from checkpoint_writer import CheckpointedCSVWriter
+from fetch_cursor import CursorStore
+from id_index import PermitIndex, UNCHANGED
+from permit_store import get_permit_store
+from archive import get_permit_archive
 
 class BaseScraper(ABC):
+    # How far before the last run's high-water mark an incremental run re-reads,
+    # to pick up permits that were published late with an older issue date
+    incremental_overlap = timedelta(days=1)
+
+    # Deliver only permits that are new or changed since earlier runs
+    track_new_leads = True
+
+    # Also append saved permits to the Parquet archive (needs pyarrow)
+    archive_permits = False
+
+    # Root of the leads/<city>/<date>/ tree (run_scrapers.py sets an absolute path)
+    output_dir = "leads"
+
     def __init__(self, city_name):
         self.city_name = city_name
+        self.city_slug = city_name.lower().replace(' ', '')
         self.base_url = ""
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
-        })
+        self.fields = []  # source columns the scraper reads ($select / outFields)
+        # Shared pooled client - keeps connections alive across pages and cities
+        self.session = get_http_client()
 
-        # Setup logging
+        # Setup logging - the logger name carries the city, so several
+        # scrapers can share one process (see run_scrapers.py)
         logging.basicConfig(
             level=logging.INFO,
-            format=f'%(asctime)s - {city_name} - %(levelname)s - %(message)s'
+            format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
         )
         self.logger = logging.getLogger(city_name)
+        self.date_parser = DateParser(self.logger)
+
+        # Failing portals open this source's circuit instead of burning retries
+        self.health_check = ScraperHealthCheck(self.city_slug)
+        self.circuit_breaker = get_circuit_breaker(self.city_slug, health_check=self.health_check)
+
+        # Incremental scraping state - see incremental_start()
+        self.incremental = True
+        self.watermark = HighWaterMark(self.city_slug)
+        # Pages fetched by a failed run of the same query window - see fetch_cursor
+        self.cursor_store = CursorStore(self.city_slug, logger=self.logger)
+        self.fetch_complete = False
+        self._boundary = None
+        self._newest = None
+        self._newest_ids = set()
+
+        # System of record - CSVs are exported from it (see save_to_csv)
+        self.store = get_permit_store()
+        self.window_start = None  # YYYY-MM-DD start of the days_back window, set by get_permits
+        self.output = None  # streaming CSV writer, see open_output()
+        self.serializer = PermitSerializer(city=city_name)
+
+        # Permit IDs delivered by earlier runs - see new_or_changed()
+        self.id_index = PermitIndex(self.city_slug) if self.track_new_leads else None
+        self.change_counts = Counter()
 
     @abstractmethod
     def get_permits(self, days_back=30):
         """Abstract method to fetch permits from the city's data source"""
         pass
 
-    def save_to_csv(self, permits, output_dir="leads"):
-        """Save permits to CSV file"""
+    def save_to_csv(self, permits, output_dir=None):
+        """
+        Upsert permits into the permit store and export the city's CSV from it
+
+        The CSV holds every permit delivered today - so a second run on the
+        same day adds its leads to the earlier run's file instead of replacing
+        it - or, when new-lead tracking is off, every stored permit issued
+        inside the days_back window.
+        """
         if not permits:
             self.logger.warning("No permits to save")
             return None
 
-        # Create output directory
-        city_dir = os.path.join(output_dir, self.city_name.lower().replace(' ', ''))
-        os.makedirs(city_dir, exist_ok=True)
+        # Code-defined scrapers may still hand over dicts - the store, the
+        # archive and the CSV all take Permit records
+        permits = self.serializer.records(permits)
+
+        changed = self.store.upsert(self.city_name, permits)
+        self.logger.info(f"Stored {len(permits)} permits ({changed} inserted or changed)")
+
+        if self.archive_permits:
+            get_permit_archive().append(self.city_name, permits)
+
+        if self.id_index is not None:
+            # This run's delivery plus whatever earlier runs delivered today. The
+            # delivery is listed itself rather than looked up by updated_at: a
+            # permit stored by a run whose CSV never got published is delivered
+            # again without changing, so its updated_at can be older than today
+            numbers = {str(permit.permit_number) for permit in permits}
+            earlier = self.store.query(self.city_name, updated_since=datetime.now().strftime('%Y-%m-%d'))
+            export = permits + [permit for permit in earlier if permit.permit_number not in numbers]
+        elif self.window_start:
+            export = self.store.query(self.city_name, issued_since=self.window_start)
+        else:
+            export = permits
+
+        if self.output is not None:
+            if len(export) == len(permits):
+                # Rows were streamed to disk page by page - just move the file into place
+                filepath = self.output.publish()
+                self.output = None
+                self.logger.info(f"Published {len(permits)} permits to {filepath}")
+                return filepath
+
+            # An earlier run today already delivered leads - rebuild the file from the store
+            self.output.discard()
+            self.output = None
+
+        filepath = self.serializer.write(self._output_path(output_dir), export, 'csv')
+
+        self.logger.info(f"Saved {len(export)} permits to {filepath}")
+        return filepath
+
+    def _output_path(self, output_dir=None):
+        """leads/<city>/<date>/<date>_<city>.csv for today, creating the directories"""
+        city_dir = os.path.join(output_dir or self.output_dir, self.city_name.lower().replace(' ', ''))
 
         # Create date-based subdirectory
         today = datetime.now().strftime('%Y-%m-%d')
         output_subdir = os.path.join(city_dir, today)
         os.makedirs(output_subdir, exist_ok=True)
 
-        # Save to CSV
         filename = f"{today}_{self.city_name.lower().replace(' ', '')}.csv"
-        filepath = os.path.join(output_subdir, filename)
-
-        if permits:
-            fieldnames = ['date', 'city', 'permit_type', 'permit_number', 'address', 'description']
-            with open(filepath, 'w', newline='', encoding='utf-8') as csvfile:
-                writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-                writer.writeheader()
-                for permit in permits:
-                    # Ensure all required fields are present
-                    permit['city'] = self.city_name
-                    writer.writerow(permit)
-
-        self.logger.info(f"Saved {len(permits)} permits to {filepath}")
-        return filepath
+        return os.path.join(output_subdir, filename)
+
+    def open_output(self, window, output_dir=None):
+        """
+        Stream delivered permits to today's CSV page by page (see checkpoint_writer)
+
+        Args:
+            window: Identifies the query window; a checkpoint left by a crashed
+                    run of the same window is resumed
+
+        Returns:
+            (permits already written by the crashed run, number of pages to skip)
+        """
+        self.output = CheckpointedCSVWriter(
+            self._output_path(output_dir), self.serializer.fieldnames,
+            os.path.join(STATE_DIR, f'{self.city_slug}_checkpoint.json'), window
+        )
+        checkpoint = self.output.open()
+        if checkpoint is None:
+            return [], 0
+
+        # The CSV holds formatted valuations ("$1,235") - restore the exact
+        # ones saved alongside each page
+        restored = [Permit.from_dict(row) for row in self.output.read_back()]
+        for permit, raw in zip(restored, self.output.read_raw()):
+            permit.value = raw.get('value', 0.0)
+
+        cursor = checkpoint.get('cursor') or {}
+        if cursor.get('newest') is not None:
+            self.track_high_water(cursor['newest'], None)
+            self._newest_ids.update(cursor.get('newest_ids', []))
+            self._newest_ids.discard(None)
+
+        self.logger.info(f"♻️  Resuming after {checkpoint['pages']} pages "
+                         f"({len(restored)} permits) from {self.output.partial_path}")
+        return restored, checkpoint['pages']
+
+    def write_page(self, permits):
+        """Append a page of delivered permits to the streaming output and checkpoint it"""
+        if self.output is not None:
+            self.output.write_page(
+                [self.serializer.csv_row(permit) for permit in permits],
+                cursor={'newest': self._newest, 'newest_ids': sorted(self._newest_ids)},
+                raw=[{'value': permit.value} for permit in permits]
+            )
 
     def clean_text(self, text):
         """Clean and normalize text data"""
@@ -71,32 +196,13 @@ class BaseScraper(ABC):
             return ""
         return str(text).strip().replace('\n', ' ').replace('\r', ' ')
 
-    def parse_date(self, date_str):
-        """Parse various date formats into YYYY-MM-DD"""
-        if not date_str:
-            return ""
+    def parse_date(self, date_str, column=None):
+        """Parse various date formats into YYYY-MM-DD (see date_parser.DateParser)"""
+        return self.date_parser.parse(date_str, column)
 
-        # Common date formats to try
-        formats = [
-            '%Y-%m-%d',
-            '%Y-%m-%dT%H:%M:%S.%f',  # ISO format with milliseconds
-            '%Y-%m-%dT%H:%M:%S',     # ISO format without milliseconds
-            '%m/%d/%Y',
-            '%Y/%m/%d',
-            '%d-%m-%Y',
-            '%m-%d-%Y',
-            '%B %d, %Y',
-            '%b %d, %Y'
-        ]
-
-        for fmt in formats:
-            try:
-                return datetime.strptime(date_str, fmt).strftime('%Y-%m-%d')
-            except ValueError:
-                continue
-
-        self.logger.warning(f"Could not parse date: {date_str}")
-        return str(date_str)
+    def parse_dates(self, values, column=None):
+        """Parse a whole column of dates into YYYY-MM-DD strings"""
+        return self.date_parser.parse_column(values, column)
 
     def is_recent(self, date_str, days_back=30):
         """Check if a date is within the specified number of days"""
@@ -110,6 +216,77 @@ class BaseScraper(ABC):
         except ValueError:
             return False
 
+    def _mark_to_datetime(self, value):
+        """Convert a raw issue date (ISO string or epoch milliseconds) to a datetime"""
+        if isinstance(value, (int, float)):
+            return datetime.fromtimestamp(value / 1000)
+        return datetime.strptime(str(value)[:10], '%Y-%m-%d')
+
+    def incremental_start(self, start_date):
+        """
+        Narrow a query window to start just before the last run's high-water mark
+
+        Falls back to the full window when there is no mark, or when the
+        permit store holds nothing for this city yet.
+        """
+        self._boundary = None
+        self._newest = None
+        self._newest_ids = set()
+        self.fetch_complete = False
+
+        mark = self.watermark.load() if self.incremental else None
+        if not mark or not self.store.count(self.city_name):
+            return start_date
+
+        try:
+            mark_date = self._mark_to_datetime(mark['value'])
+        except (TypeError, ValueError):
+            self.logger.warning(f"Ignoring unreadable high-water mark: {mark['value']}")
+            return start_date
+
+        self._boundary = (mark['value'], set(mark.get('ids', [])))
+        self._newest, self._newest_ids = mark['value'], set(mark.get('ids', []))
+
+        incremental = max(start_date, mark_date - self.incremental_overlap)
+        if incremental > start_date:
+            self.logger.info(f"Incremental run from {incremental.strftime('%Y-%m-%d')} "
+                             f"(high-water mark {mark['value']})")
+        return incremental
+
+    def seen_at_boundary(self, raw_date, permit_id):
+        """True if a record was already collected at the last run's high-water mark"""
+        return (self._boundary is not None
+                and raw_date == self._boundary[0]
+                and permit_id in self._boundary[1])
+
+    def track_high_water(self, raw_date, permit_id):
+        """Remember the newest raw issue date seen this run and the IDs issued at it"""
+        if raw_date is None or raw_date == '':
+            return
+        if self._newest is None or raw_date > self._newest:
+            self._newest = raw_date
+            self._newest_ids = {permit_id}
+        elif raw_date == self._newest:
+            self._newest_ids.add(permit_id)
+
+    def commit_high_water(self):
+        """Persist the high-water mark once a complete run has been saved"""
+        if self.fetch_complete and self._newest is not None:
+            self.watermark.save(self._newest, self._newest_ids)
+
+    def new_or_changed(self, permits):
+        """Drop permits an earlier run already delivered unchanged (see id_index.PermitIndex)"""
+        if self.id_index is None or not permits:
+            return permits
+        states = self.id_index.classify(permits)
+        self.change_counts.update(states)
+        return [permit for permit, state in zip(permits, states) if state != UNCHANGED]
+
+    def commit_seen(self):
+        """Record the delivered permits in the ID index once they have been saved"""
+        if self.id_index is not None:
+            self.id_index.commit()
+
     def run(self, days_back=30, save_to_csv=True):
         """Main method to run the scraper"""
         self.logger.info(f"Starting scrape for {self.city_name}")
@@ -119,6 +296,10 @@ class BaseScraper(ABC):
 
             if save_to_csv:
                 filepath = self.save_to_csv(permits)
+                if filepath:
+                    self.commit_high_water()
+                    self.commit_seen()
+                    self.health_check.record_success(len(permits))
                 return permits, filepath
             else:
                 return permits, None
@@ -0,0 +1,76 @@
+"""
+Vectorized normalization of fetched API pages
+
+A page of records is pulled apart into columns once, and valuations and
+epoch-millisecond dates are converted with NumPy array operations instead of
+a str/replace/float/strftime round trip per record. Valuations stay numeric
+on the permit; format_valuation renders them only when a CSV is written.
+"""
+import numpy as np
+
+
+def column(records, field):
+    """Return one field of a page of records as a list"""
+    return [record.get(field) for record in records]
+
+
+def parse_valuations(values):
+    """
+    Parse a column of construction values ("$1,234.50", 1234.5, None, ...)
+
+    Args:
+        values: Sequence of raw values from one page
+
+    Returns:
+        float64 array, 0 where a value is missing or not a number
+    """
+    if not len(values):
+        return np.zeros(0)
+
+    text = np.array(['' if value is None else str(value) for value in values])
+    text = np.char.strip(np.char.replace(np.char.replace(text, '$', ''), ',', ''))
+    text[text == ''] = '0'
+
+    try:
+        parsed = text.astype(np.float64)
+    except ValueError:
+        # A stray non-numeric value - fall back to per-value parsing for this page
+        parsed = np.array([_to_float(value) for value in text])
+
+    return np.nan_to_num(parsed, nan=0.0, posinf=0.0, neginf=0.0)
+
+
+def _to_float(text):
+    try:
+        return float(text)
+    except ValueError:
+        return 0.0
+
+
+def epoch_ms_to_dates(values):
+    """
+    Convert a column of epoch milliseconds (as ArcGIS sends dates) to local YYYY-MM-DD
+
+    Returns:
+        List of date strings, "" where a value is missing
+    """
+    if not len(values):
+        return []
+
+    millis = np.array([np.nan if value is None or value == '' else value for value in values],
+                      dtype=np.float64)
+    missing = np.isnan(millis)
+    stamps = np.where(missing, 0, millis).astype(np.int64).astype('datetime64[ms]')
+
+    dates = np.datetime_as_string(stamps, unit='D', timezone='local', casting='unsafe')
+    dates[missing] = ''
+    return dates.tolist()
+
+
+def format_valuation(value):
+    """Render a numeric valuation for CSV ("$1,235" or "N/A"); strings pass through"""
+    if isinstance(value, str):
+        return value
+    if not value or value <= 0:
+        return 'N/A'
+    return f"${value:,.0f}"
@@ -0,0 +1,185 @@
+"""
+Streaming CSV writer with per-page checkpoints and atomic publish
+
+The fetch loop hands each page of rows to the writer as it arrives. Rows go
+to a <file>.partial next to the final CSV and are flushed to disk, then a
+small checkpoint records how many pages and bytes are safely written. When
+the run completes, publish() renames the partial file into place, so readers
+never see a half-written CSV. A run that dies mid-way leaves the partial
+file and checkpoint behind, and the next run of the same query window picks
+up from the last completed page instead of starting over.
+
+Values the CSV only holds in formatted form (e.g. "$1,235" for 1234.5) can be
+kept exactly in a <file>.partial.raw sidecar - one JSON line per page - so a
+resumed run restores them as they were fetched rather than parsing the CSV.
+"""
+import csv
+import json
+import os
+from datetime import datetime
+
+from utils import write_json_atomic
+
+
+class CheckpointedCSVWriter:
+    """Page-at-a-time CSV writer that can resume a crashed run"""
+
+    def __init__(self, filepath, fieldnames, checkpoint_file, window=None):
+        """
+        Args:
+            filepath: Final CSV path, written only by publish()
+            fieldnames: CSV columns
+            checkpoint_file: JSON file recording progress
+            window: Identifies the query (e.g. its date range); a checkpoint
+                    from a different window is discarded instead of resumed
+        """
+        self.filepath = filepath
+        self.partial_path = f"{filepath}.partial"
+        self.raw_path = f"{self.partial_path}.raw"
+        self.fieldnames = list(fieldnames)
+        self.checkpoint_file = checkpoint_file
+        self.window = window
+        self.pages = 0
+        self.rows = 0
+        self._file = None
+        self._writer = None
+        self._raw_file = None
+
+    def _load_checkpoint(self):
+        if not os.path.exists(self.checkpoint_file):
+            return None
+        try:
+            with open(self.checkpoint_file, 'r') as f:
+                return json.load(f)
+        except Exception:
+            return None
+
+    def _save_checkpoint(self, cursor=None):
+        checkpoint = {
+            'file': self.filepath,
+            'window': self.window,
+            'fieldnames': self.fieldnames,
+            'pages': self.pages,
+            'rows': self.rows,
+            'bytes': self._file.tell(),
+            'raw_bytes': self._raw_file.tell(),
+            'cursor': cursor,
+            'updated': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        }
+        write_json_atomic(self.checkpoint_file, checkpoint)
+
+    def open(self):
+        """
+        Start the partial file, resuming a matching checkpoint if there is one
+
+        Returns:
+            The checkpoint dict being resumed (pages, rows, cursor), or None
+        """
+        os.makedirs(os.path.dirname(self.filepath) or '.', exist_ok=True)
+        os.makedirs(os.path.dirname(self.checkpoint_file) or '.', exist_ok=True)
+
+        checkpoint = self._load_checkpoint()
+        resumable = (checkpoint is not None
+                     and checkpoint.get('file') == self.filepath
+                     and checkpoint.get('window') == self.window
+                     and checkpoint.get('fieldnames') == self.fieldnames
+                     and os.path.exists(self.partial_path)
+                     and os.path.getsize(self.partial_path) >= checkpoint.get('bytes', 0)
+                     and os.path.exists(self.raw_path)
+                     and os.path.getsize(self.raw_path) >= checkpoint.get('raw_bytes', 0))
+
+        if resumable:
+            # Drop anything written after the last completed page
+            os.truncate(self.partial_path, checkpoint['bytes'])
+            os.truncate(self.raw_path, checkpoint['raw_bytes'])
+            self._file = open(self.partial_path, 'a', newline='', encoding='utf-8')
+            self._raw_file = open(self.raw_path, 'a', encoding='utf-8')
+            self._writer = csv.writer(self._file)
+            self.pages = checkpoint['pages']
+            self.rows = checkpoint['rows']
+            return checkpoint
+
+        if checkpoint is not None and checkpoint.get('file') not in (None, self.filepath):
+            self._remove_stale(checkpoint['file'])
+
+        self._file = open(self.partial_path, 'w', newline='', encoding='utf-8')
+        self._raw_file = open(self.raw_path, 'w', encoding='utf-8')
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(self.fieldnames)
+        self.pages = 0
+        self.rows = 0
+        self._file.flush()
+        self._save_checkpoint()
+        return None
+
+    def _remove_stale(self, filepath):
+        """Delete the partial files an abandoned checkpoint left next to another CSV"""
+        partial_path = f"{filepath}.partial"
+        for path in (partial_path, f"{partial_path}.raw"):
+            if os.path.exists(path):
+                os.remove(path)
+
+        # Drop the dated directory too if the crashed run was all that was in it
+        try:
+            os.rmdir(os.path.dirname(filepath))
+        except OSError:
+            pass
+
+    def read_back(self):
+        """Rows already in the partial file (used to restore state on resume)"""
+        self._file.flush()
+        with open(self.partial_path, 'r', newline='', encoding='utf-8') as f:
+            return list(csv.DictReader(f))
+
+    def read_raw(self):
+        """Raw values saved with the pages already written, one dict per row"""
+        self._raw_file.flush()
+        raw = []
+        with open(self.raw_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                raw.extend(json.loads(line))
+        return raw
+
+    def write_page(self, rows, cursor=None, raw=None):
+        """
+        Append one page of rows and checkpoint it
+
+        Args:
+            rows: Row sequences in fieldnames order
+            cursor: Optional JSON-serializable resume state stored with the checkpoint
+            raw: Optional JSON-serializable dict per row, kept exactly for read_raw()
+        """
+        self._writer.writerows(rows)
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._raw_file.write(json.dumps(raw if raw is not None else [{} for _ in rows]) + '\n')
+        self._raw_file.flush()
+        os.fsync(self._raw_file.fileno())
+        self.pages += 1
+        self.rows += len(rows)
+        self._save_checkpoint(cursor)
+
+    def close(self):
+        """Stop writing, keeping the partial file and checkpoint for a later resume"""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        if self._raw_file is not None:
+            self._raw_file.close()
+            self._raw_file = None
+
+    def publish(self):
+        """Atomically move the finished CSV into place and drop the checkpoint"""
+        self.close()
+        os.replace(self.partial_path, self.filepath)
+        for path in (self.raw_path, self.checkpoint_file):
+            if os.path.exists(path):
+                os.remove(path)
+        return self.filepath
+
+    def discard(self):
+        """Throw away the partial file and checkpoint"""
+        self.close()
+        for path in (self.partial_path, self.raw_path, self.checkpoint_file):
+            if os.path.exists(path):
+                os.remove(path)
@@ -0,0 +1,102 @@
+"""
+Format-memoizing date parser for permit records
+
+Normalizes source dates to YYYY-MM-DD without trying every strptime format
+on every value: ISO strings and epoch milliseconds take a fast path, the
+format that worked for a source column is tried first from then on, and
+repeated strings are answered from an LRU cache.
+"""
+import re
+from datetime import datetime, date
+from functools import lru_cache
+
+# Tried in order when a value's format is not known yet
+FORMATS = [
+    '%Y-%m-%d',
+    '%Y-%m-%dT%H:%M:%S.%f',  # ISO format with milliseconds
+    '%Y-%m-%dT%H:%M:%S',     # ISO format without milliseconds
+    '%m/%d/%Y',
+    '%Y/%m/%d',
+    '%d-%m-%Y',
+    '%m-%d-%Y',
+    '%B %d, %Y',
+    '%b %d, %Y'
+]
+
+# YYYY-MM-DD, optionally followed by a time of day
+ISO_DATE = re.compile(r'(\d{4})-(\d{2})-(\d{2})(?:[T ]\d{2}:\d{2}(?::\d{2}(?:\.\d+)?)?)?(?:Z|[+-]\d{2}:?\d{2})?$')
+
+
+class DateParser:
+    """Parse source dates to YYYY-MM-DD, learning each column's format"""
+
+    def __init__(self, logger=None, cache_size=8192):
+        self.logger = logger
+        self.column_formats = {}  # column -> strptime format that last matched
+        self._parse_string = lru_cache(maxsize=cache_size)(self._parse_string_uncached)
+
+    def parse(self, value, column=None):
+        """
+        Parse one value to YYYY-MM-DD
+
+        Args:
+            value: Date string, or epoch milliseconds (int/float) as ArcGIS sends
+            column: Source column name, used to remember the winning format
+
+        Returns:
+            YYYY-MM-DD string, "" for empty input, or the input as a string if
+            it could not be parsed
+        """
+        if value is None or value == '':
+            return ""
+
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            return self._from_epoch_ms(value)
+
+        result, fmt = self._parse_string(str(value).strip(), self.column_formats.get(column))
+        if fmt and column is not None:
+            self.column_formats[column] = fmt
+        return result
+
+    def parse_column(self, values, column=None):
+        """Parse a whole column of values; returns a list in the same order"""
+        parse = self.parse
+        return [parse(value, column) for value in values]
+
+    def _from_epoch_ms(self, ms):
+        try:
+            return datetime.fromtimestamp(ms / 1000).strftime('%Y-%m-%d')
+        except (OverflowError, OSError, ValueError):
+            return str(ms)
+
+    def _parse_string_uncached(self, text, column_format):
+        """Return (YYYY-MM-DD or original text, format that matched or None)"""
+        match = ISO_DATE.match(text)
+        if match:
+            year, month, day = (int(part) for part in match.groups())
+            try:
+                date(year, month, day)
+                return text[:10], None
+            except ValueError:
+                pass
+
+        if text.isdigit() and len(text) >= 12:
+            return self._from_epoch_ms(int(text)), None
+
+        if column_format:
+            try:
+                return datetime.strptime(text, column_format).strftime('%Y-%m-%d'), column_format
+            except ValueError:
+                pass
+
+        for fmt in FORMATS:
+            if fmt == column_format:
+                continue
+            try:
+                return datetime.strptime(text, fmt).strftime('%Y-%m-%d'), fmt
+            except ValueError:
+                continue
+
+        if self.logger:
+            self.logger.warning(f"Could not parse date: {text}")
+        return text, None
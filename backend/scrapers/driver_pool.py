@@ -0,0 +1,192 @@
+"""
+Reusable headless Chrome driver pool for Selenium scrapers
+
+Keeps a bounded number of warm browsers so several portal cities can share
+browser processes in one run instead of paying Chrome's cold start each
+time. Drivers are handed out with cookies, storage and extra windows cleared,
+and are recycled after max_uses checkouts or once their JS heap grows past
+max_memory_mb.
+"""
+import atexit
+import threading
+import time
+from urllib.parse import urlparse
+
+from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
+
+
+class DriverPoolTimeout(Exception):
+    """Raised when no driver becomes available in time"""
+
+
+class ChromeDriverPool:
+    """Bounded pool of warm headless Chrome drivers"""
+
+    def __init__(self, options_factory, size=2, max_uses=25, max_memory_mb=512, logger=None):
+        """
+        Args:
+            options_factory: Callable returning fresh ChromeOptions for a new driver
+            size: Maximum number of live browsers
+            max_uses: Checkouts after which a driver is quit and replaced
+            max_memory_mb: JS heap size after which a driver is replaced
+            logger: Optional logger instance
+        """
+        self.options_factory = options_factory
+        self.size = size
+        self.max_uses = max_uses
+        self.max_memory_mb = max_memory_mb
+        self.logger = logger
+
+        self._idle = []
+        self._uses = {}  # id(driver) -> checkouts so far
+        self._live = 0
+        self._closed = False
+        self._cond = threading.Condition()
+
+    def _log(self, message):
+        if self.logger:
+            self.logger.info(message)
+
+    def _create(self):
+        driver = webdriver.Chrome(options=self.options_factory())
+        driver.set_page_load_timeout(30)
+        self._uses[id(driver)] = 0
+        self._log("Pool started a new Chrome driver")
+        return driver
+
+    def _quit(self, driver):
+        self._uses.pop(id(driver), None)
+        try:
+            driver.quit()
+        except Exception as e:
+            if self.logger:
+                self.logger.warning(f"Error quitting pooled driver: {e}")
+
+    def acquire(self, timeout=120):
+        """Check out a clean driver, starting one if the pool has room"""
+        deadline = time.monotonic() + timeout
+
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise RuntimeError("Driver pool is closed")
+                if self._idle:
+                    driver = self._idle.pop()
+                    break
+                if self._live < self.size:
+                    self._live += 1
+                    driver = None
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise DriverPoolTimeout(f"No Chrome driver free after {timeout}s")
+                self._cond.wait(remaining)
+
+        if driver is None:
+            try:
+                driver = self._create()
+            except Exception:
+                with self._cond:
+                    self._live -= 1
+                    self._cond.notify()
+                raise
+
+        self._uses[id(driver)] += 1
+        return driver
+
+    def release(self, driver, discard=False):
+        """Return a driver; it is reset for the next user, or quit if it is worn out"""
+        if driver is None:
+            return
+
+        worn_out = (discard
+                    or self._uses.get(id(driver), 0) >= self.max_uses
+                    or self._memory_mb(driver) > self.max_memory_mb)
+
+        if not worn_out:
+            try:
+                self._reset(driver)
+            except WebDriverException as e:
+                if self.logger:
+                    self.logger.warning(f"Could not reset pooled driver, replacing it: {e}")
+                worn_out = True
+
+        if worn_out:
+            self._log(f"Recycling Chrome driver after {self._uses.get(id(driver), 0)} uses")
+            self._quit(driver)
+
+        with self._cond:
+            if worn_out:
+                self._live -= 1
+            elif self._closed:
+                self._live -= 1
+                self._quit(driver)
+            else:
+                self._idle.append(driver)
+            self._cond.notify()
+
+    def _memory_mb(self, driver):
+        """JS heap of the driver's page in MB (0 if it cannot be read)"""
+        try:
+            driver.execute_cdp_cmd('Performance.enable', {})
+            metrics = driver.execute_cdp_cmd('Performance.getMetrics', {})
+            sizes = {m['name']: m['value'] for m in metrics.get('metrics', [])}
+            return sizes.get('JSHeapTotalSize', 0) / (1024 * 1024)
+        except Exception:
+            return 0
+
+    def _reset(self, driver):
+        """Clear cookies, storage, cache and extra windows left by the last user"""
+        handles = driver.window_handles
+        for handle in handles[1:]:
+            driver.switch_to.window(handle)
+            driver.close()
+        driver.switch_to.window(handles[0])
+
+        parsed = urlparse(driver.current_url)
+        if parsed.scheme in ('http', 'https'):
+            driver.execute_cdp_cmd('Storage.clearDataForOrigin', {
+                'origin': f"{parsed.scheme}://{parsed.netloc}",
+                'storageTypes': 'all',
+            })
+
+        driver.delete_all_cookies()
+        driver.execute_cdp_cmd('Network.clearBrowserCookies', {})
+        driver.execute_cdp_cmd('Network.clearBrowserCache', {})
+        driver.get('about:blank')
+
+    def close(self):
+        """Quit every idle driver; drivers still checked out are quit on release"""
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._live -= len(idle)
+            self._cond.notify_all()
+
+        for driver in idle:
+            self._quit(driver)
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_driver_pool(name, options_factory, **kwargs):
+    """Return the process-wide driver pool for a browser profile, creating it on first use"""
+    with _pools_lock:
+        pool = _pools.get(name)
+        if pool is None:
+            pool = ChromeDriverPool(options_factory, **kwargs)
+            _pools[name] = pool
+        return pool
+
+
+@atexit.register
+def close_driver_pools():
+    """Quit all pooled browsers"""
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.close()
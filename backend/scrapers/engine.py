@@ -0,0 +1,317 @@
+#!/usr/bin/env python3
+"""
+Declarative scraper engine for open-data permit APIs
+
+Each city is an entry in config.json naming its source family, endpoint,
+date field, field mapping and address recipe, e.g.
+
+    "austin": {
+      "valid_states": ["TX"],
+      "name": "Austin",
+      "source": "socrata",
+      "endpoint": "https://data.austintexas.gov/resource/3syk-w9eu.json",
+      "date_field": "issue_date",
+      "fields": {"permit_number": "permit_number", "type": "work_class",
+                 "value": "total_project_valuation", "status": "status_current"},
+      "address": {"fields": ["address_number", "street_name"],
+                  "locality": "Austin, TX", "separator": " "}
+    }
+
+SocrataScraper and ArcGISScraper share one pagination/normalization loop,
+so every configured city gets the fast path (concurrent pages, column
+projection, streaming decode, incremental windows) without any code.
+"""
+
+import sys
+from abc import abstractmethod
+from datetime import datetime, timedelta
+import requests
+from base_scraper import BaseScraper
+from utils import retry_with_backoff, load_scraper_config
+from state_validator import StateValidator
+from batch_normalize import column, parse_valuations, epoch_ms_to_dates
+from permit import Permit
+from socrata import SocrataFetcher
+from arcgis import ArcGISFetcher
+from json_stream import iter_socrata_records, iter_arcgis_attributes
+
+
+class ConfigScraper(BaseScraper):
+    """Permit scraper driven by a city's config.json entry"""
+
+    source = None
+
+    def __init__(self, city_key, config=None):
+        if config is None:
+            config = load_scraper_config().get(city_key)
+        if not config or config.get('source') != self.source:
+            raise ValueError(f"No {self.source} scraper config for {city_key}")
+
+        super().__init__(config.get('name', city_key.title()))
+        self.city_key = city_key
+        self.config = config
+        self.base_url = config['endpoint']
+        self.date_field = config['date_field']
+        self.field_map = config.get('fields', {})
+        self.address_recipe = config.get('address', {})
+
+        # Only the mapped columns are requested ($select / outFields)
+        self.fields = list(dict.fromkeys(
+            list(self.field_map.values()) + [self.date_field] + self.address_recipe.get('fields', [])
+        ))
+        self.state_validator = StateValidator(city_key, config.get('valid_states', []), self.logger)
+        self.permits = []
+        self.seen_permit_ids = set()
+
+    @retry_with_backoff(max_retries=3, initial_delay=2, exceptions=(requests.RequestException,))
+    def _fetch_batch(self, params, url=None, method='get'):
+        """Fetch a single batch of permits with retry logic"""
+        if method == 'post':
+            response = self.session.post(url or self.base_url, data=params, cache=True)
+        else:
+            response = self.session.get(url or self.base_url, params=params)
+        response.raise_for_status()
+        return response.json()
+
+    @retry_with_backoff(max_retries=3, initial_delay=2, exceptions=(requests.RequestException,))
+    def _fetch_records(self, params, method='get'):
+        """Fetch a page of records, decoding them while the body is still arriving"""
+        if method == 'post':
+            response = self.session.post(self.base_url, data=params, stream=True)
+        else:
+            response = self.session.get(self.base_url, params=params, stream=True)
+        with response:
+            response.raise_for_status()
+            return list(self.decode_records(response))
+
+    @abstractmethod
+    def decode_records(self, response):
+        """Yield the records of a streamed page response"""
+
+    @abstractmethod
+    def iter_pages(self, start_date, end_date, max_permits, start_page=0):
+        """Yield pages of raw source records for the date window, newest first"""
+
+    def format_dates(self, raw_dates):
+        """Format a page of raw source dates to YYYY-MM-DD ('N/A' when missing)"""
+        return [date or 'N/A' for date in self.parse_dates(raw_dates, self.date_field)]
+
+    def build_address(self, record):
+        """Build a full address from the city's address recipe"""
+        parts = [str(record.get(field) or '').strip() for field in self.address_recipe.get('fields', [])]
+        address = ' '.join(filter(None, parts))
+        locality = self.address_recipe.get('locality', '')
+
+        if not address:
+            return locality
+
+        # Some sources already include the city/state in the address column
+        only_if_missing = self.address_recipe.get('only_if_missing')
+        if locality and only_if_missing and any(token in address for token in only_if_missing):
+            return address
+
+        return self.address_recipe.get('separator', ' ').join(filter(None, [address, locality]))
+
+    def normalize(self, record, permit_id, issued_date, address, value):
+        """Map one raw record and its page-normalized columns to a Permit"""
+        return Permit(
+            permit_number=permit_id,
+            address=address,
+            type=record.get(self.field_map.get('type'), 'N/A'),
+            value=value,
+            issued_date=issued_date,
+            status=record.get(self.field_map.get('status'), 'N/A'),
+            city=self.city_name,
+            description=record.get(self.field_map.get('description'), '')
+        )
+
+    def get_permits(self, max_permits=5000, days_back=30):
+        """
+        Scrape building permits
+
+        Args:
+            max_permits: Maximum number of permits to retrieve
+            days_back: Number of days back to search (default 30)
+        """
+        state = '/'.join(self.config.get('valid_states', []))
+        self.logger.info("=" * 60)
+        self.logger.info(f"🏗️  {self.city_name} {state} Construction Permits Scraper")
+        self.logger.info(f"Fetching up to {max_permits} permits from last {days_back} days...")
+
+        print(f"🏗️  {self.city_name} {state} Construction Permits Scraper")
+        print(f"=" * 60)
+        print(f"Fetching up to {max_permits} permits from last {days_back} days...")
+        print()
+
+        # Calculate date range
+        end_date = datetime.now()
+        start_date = end_date - timedelta(days=days_back)
+        self.window_start = start_date.strftime('%Y-%m-%d')
+        start_date = self.incremental_start(start_date)
+
+        self.logger.info(f"Date Range: {start_date.strftime('%Y-%m-%d')} to {end_date.strftime('%Y-%m-%d')}")
+        print(f"Date Range: {start_date.strftime('%Y-%m-%d')} to {end_date.strftime('%Y-%m-%d')}")
+        print()
+
+        id_field = self.field_map.get('permit_number')
+
+        # Delivered permits stream to disk as pages arrive; a crashed run of
+        # the same window resumes after its last checkpointed page
+        # (new_or_changed() only filters when the city tracks new leads)
+        window = f"{start_date.strftime('%Y-%m-%d')}..{end_date.strftime('%Y-%m-%d')}"
+        restored, start_page = self.open_output(window)
+        self.seen_permit_ids.update(permit.permit_number for permit in restored)
+        self.new_or_changed(restored)
+        self.permits.extend(restored)
+
+        try:
+            for data in self.iter_pages(start_date, end_date, max_permits, start_page):
+                # Dates, valuations and state checks run once per page, not per record
+                issued_dates = self.format_dates(column(data, self.date_field))
+                values = parse_valuations(column(data, self.field_map.get('value'))).tolist()
+                addresses = [self.build_address(record) for record in data]
+                in_state, _ = self.state_validator.validate_many(addresses)
+
+                page = []
+                for record, issued_date, address, value, valid in zip(data, issued_dates, addresses,
+                                                                      values, in_state):
+                    permit_id = str(record.get(id_field, ''))
+
+                    if permit_id and permit_id not in self.seen_permit_ids:
+                        self.seen_permit_ids.add(permit_id)
+
+                        raw_date = record.get(self.date_field)
+                        if self.seen_at_boundary(raw_date, permit_id):
+                            continue
+                        self.track_high_water(raw_date, permit_id)
+
+                        if valid:
+                            page.append(self.normalize(record, permit_id, issued_date, address, value))
+
+                fresh = self.new_or_changed(page)
+                self.permits.extend(fresh)
+                self.write_page(fresh)
+
+                self.logger.debug(f"Fetched {len(data)} records")
+
+                if len(self.permits) >= max_permits:
+                    break
+
+            self.fetch_complete = True
+            self.cursor_store.finish()
+
+        except Exception as e:
+            self.logger.error(f"Error: {e}")
+            self.health_check.record_failure(f"Fetch stopped after {len(self.permits)} permits: {e}")
+
+        if self.id_index is not None:
+            counts = self.change_counts
+            self.logger.info(f"🆕 {counts['new']} new, {counts['changed']} changed, "
+                             f"{counts['unchanged']} already delivered")
+
+        print(f"✅ Scraping Complete! Found {len(self.permits)} permits")
+        print(f"=" * 60)
+        print()
+
+        return self.permits
+
+    def run(self):
+        try:
+            permits = self.get_permits()
+            if not self.fetch_complete and self.output is not None:
+                # Keep the partial CSV and checkpoint - the next run resumes from them
+                self.output.close()
+                return permits, None
+            if permits:
+                filepath = self.save_to_csv(permits)
+                if filepath:
+                    self.commit_high_water()
+                    self.commit_seen()
+                    if self.fetch_complete:
+                        self.health_check.record_success(len(permits))
+                return permits, filepath
+            if self.fetch_complete:
+                # Nothing new today, but the whole window was read
+                self.commit_high_water()
+                if self.output is not None:
+                    self.output.discard()
+                self.health_check.record_success(0)
+            return [], None
+        except Exception as e:
+            self.logger.error(f"Fatal error: {e}")
+            return [], None
+
+
+class SocrataScraper(ConfigScraper):
+    """Config-driven scraper for Socrata (SODA) datasets"""
+
+    source = 'socrata'
+
+    def decode_records(self, response):
+        return iter_socrata_records(response)
+
+    def iter_pages(self, start_date, end_date, max_permits, start_page=0):
+        start_str = start_date.strftime('%Y-%m-%d')
+        end_str = end_date.strftime('%Y-%m-%d')
+        where = (f"{self.date_field} >= '{start_str}T00:00:00' "
+                 f"AND {self.date_field} <= '{end_str}T23:59:59'")
+
+        fetcher = SocrataFetcher(self._fetch_batch, page_size=1000, logger=self.logger,
+                                 fetch_records=self._fetch_records)
+        return fetcher.iter_pages(where, f"{self.date_field} DESC", max_rows=max_permits,
+                                  params={'$select': ','.join(self.fields)}, start_page=start_page,
+                                  cursor_store=self.cursor_store)
+
+
+class ArcGISScraper(ConfigScraper):
+    """Config-driven scraper for ArcGIS FeatureServer layers"""
+
+    source = 'arcgis'
+
+    def decode_records(self, response):
+        return iter_arcgis_attributes(response)
+
+    def format_dates(self, raw_dates):
+        # ArcGIS dates are epoch milliseconds - convert the whole page at once
+        return [date or 'N/A' for date in epoch_ms_to_dates(raw_dates)]
+
+    def iter_pages(self, start_date, end_date, max_permits, start_page=0):
+        # ArcGIS dates are epoch milliseconds - whole days, so reruns on the
+        # same day send an identical (cacheable) query
+        start_timestamp = int(start_date.replace(hour=0, minute=0, second=0, microsecond=0).timestamp() * 1000)
+        end_timestamp = int(end_date.replace(hour=23, minute=59, second=59, microsecond=0).timestamp() * 1000)
+        where = f"{self.date_field} >= {start_timestamp} AND {self.date_field} <= {end_timestamp}"
+
+        fetcher = ArcGISFetcher(self._fetch_batch, self.base_url, logger=self.logger,
+                                fetch_records=self._fetch_records)
+        return fetcher.iter_pages(where, out_fields=','.join(self.fields),
+                                  order_by=f"{self.date_field} DESC", max_rows=max_permits,
+                                  params={'returnGeometry': 'false'}, start_page=start_page,
+                                  cursor_store=self.cursor_store)
+
+
+ENGINES = {
+    SocrataScraper.source: SocrataScraper,
+    ArcGISScraper.source: ArcGISScraper,
+}
+
+
+def configured_cities():
+    """Return the city keys in config.json that an engine can scrape"""
+    return [city for city, config in load_scraper_config().items()
+            if isinstance(config, dict) and config.get('source') in ENGINES]
+
+
+def build_scraper(city_key):
+    """Create the engine scraper for a city from its config.json entry"""
+    config = load_scraper_config().get(city_key)
+    if not config or config.get('source') not in ENGINES:
+        raise ValueError(f"No scraper source configured for {city_key}")
+    return ENGINES[config['source']](city_key, config)
+
+
+if __name__ == "__main__":
+    for city_key in sys.argv[1:] or configured_cities():
+        scraper = build_scraper(city_key)
+        permits, filepath = scraper.run()
+        print(f"Scraped {len(permits)} permits, saved to {filepath}")
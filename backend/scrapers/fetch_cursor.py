@@ -0,0 +1,146 @@
+"""
+Persisted fetch cursors for resumable paginated queries
+
+Pages of a query window are fetched concurrently and can finish in any
+order, so a failed run used to throw away every page it had and the next run
+started again from page 0. A FetchCursor records which pages of one window
+are done and keeps their records on disk under backend/state/cursors/, so a
+retried or rescheduled run of the same window fetches only the missing
+pages. That matters most for multi-year backfills, where starting over costs
+hours. Data pages are streamed past the HTTP cache (see http_client), so the
+spilled page is the only copy of it on disk.
+
+The window is identified by everything that determines page contents (the
+where clause, ordering, page size, row count or object IDs), so a window
+whose source data moved on is never resumed with stale pages.
+"""
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+from datetime import datetime
+
+from utils import STATE_DIR, write_json_atomic
+
+CURSOR_DIR = os.path.join(STATE_DIR, 'cursors')
+
+
+class FetchCursor:
+    """Completed pages of one query window"""
+
+    def __init__(self, directory, window, logger=None):
+        self.directory = directory
+        self.window = window
+        self.logger = logger
+        self.state_file = os.path.join(directory, 'cursor.json')
+        self._lock = threading.Lock()
+
+        state = None
+        if os.path.exists(self.state_file):
+            try:
+                with open(self.state_file, 'r') as f:
+                    state = json.load(f)
+            except Exception:
+                state = None
+        if not state or state.get('window') != window:
+            state = {'window': window, 'pages': {}, 'created': datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+        self.state = state
+
+    @property
+    def done_pages(self):
+        """Indexes of the pages already fetched"""
+        return sorted(int(page) for page in self.state['pages'])
+
+    @property
+    def last_page(self):
+        """Highest contiguous page index fetched from the start (-1 if none)"""
+        done = set(self.done_pages)
+        page = -1
+        while page + 1 in done:
+            page += 1
+        return page
+
+    def _page_file(self, page):
+        return os.path.join(self.directory, f'page-{page}.json')
+
+    def fetch(self, page, fetch_page, *args, **kwargs):
+        """
+        Return a page's records from disk if this window already fetched it,
+        otherwise call fetch_page(*args, **kwargs) and persist the result
+        """
+        if str(page) in self.state['pages']:
+            try:
+                with open(self._page_file(page), 'r') as f:
+                    return json.load(f)
+            except Exception:
+                pass  # lost or unreadable spill - fetch the page again
+
+        records = fetch_page(*args, **kwargs) or []
+
+        with self._lock:
+            os.makedirs(self.directory, exist_ok=True)
+            write_json_atomic(self._page_file(page), records)
+            self.state['pages'][str(page)] = len(records)
+            self.state['updated'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            write_json_atomic(self.state_file, self.state)
+        return records
+
+    def log_resume(self, total_pages):
+        done = len(self.state['pages'])
+        if done and self.logger:
+            self.logger.info(f"♻️  Resuming fetch: {done} of {total_pages} pages already fetched "
+                             f"(contiguous through page {self.last_page})")
+
+    def finish(self):
+        """The whole window was consumed - drop its cursor and spilled pages"""
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+
+class CursorStore:
+    """Fetch cursors of one scraper, one per query window"""
+
+    def __init__(self, scraper_name, root=None, max_age_days=14, logger=None):
+        """
+        Args:
+            scraper_name: Scraper slug (e.g., 'houston')
+            root: Cursor directory (default: backend/state/cursors)
+            max_age_days: Cursors untouched for longer are pruned
+            logger: Optional logger instance
+        """
+        self.scraper_name = scraper_name
+        self.directory = os.path.join(root or CURSOR_DIR, scraper_name)
+        self.max_age_days = max_age_days
+        self.logger = logger
+        self._opened = []
+
+    def cursor(self, **window):
+        """Return the cursor for a query window described by keyword values"""
+        self.prune()
+        text = json.dumps(window, sort_keys=True, default=str)
+        key = hashlib.sha1(text.encode('utf-8')).hexdigest()[:16]
+        cursor = FetchCursor(os.path.join(self.directory, key), json.loads(text), self.logger)
+        self._opened.append(cursor)
+        return cursor
+
+    def finish(self):
+        """
+        The fetch that opened cursors since the last finish() completed - drop them
+
+        A fetch can stop reading pages early (e.g. at max_permits) and still be
+        complete, so its fetcher never reaches its own cursor.finish().
+        """
+        for cursor in self._opened:
+            cursor.finish()
+        self._opened = []
+
+    def prune(self):
+        """Remove cursors of windows abandoned more than max_age_days ago"""
+        if not os.path.isdir(self.directory):
+            return
+        cutoff = time.time() - self.max_age_days * 86400
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            if os.path.isdir(path) and os.path.getmtime(path) < cutoff:
+                shutil.rmtree(path, ignore_errors=True)
@@ -0,0 +1,187 @@
+"""
+On-disk HTTP response cache for the scraper HTTP client
+
+Entries are keyed by method + URL + query/form parameters and keep the
+response's ETag / Last-Modified validators. Fresh entries are served without
+touching the network, stale ones are revalidated with a conditional request,
+and the cache is held under a byte budget by least-recently-used eviction.
+"""
+import os
+import re
+import json
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+from urllib.parse import urlencode
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+CACHE_DIR = os.path.join(os.path.dirname(__file__), '../cache/http')
+
+# Response headers worth keeping with a cached body
+KEPT_HEADERS = ('Content-Type', 'ETag', 'Last-Modified', 'Date')
+
+# ArcGIS reports failures as HTTP 200 with an {"error": {...}} body
+ERROR_BODY = re.compile(rb'\s*\{\s*"error"\s*:')
+
+
+class ResponseCache:
+    """Size-bounded LRU cache of successful responses, stored as files"""
+
+    def __init__(self, cache_dir=CACHE_DIR, max_bytes=256 * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._index = None  # key -> body size, least recently used first
+        self._total = 0
+
+    @staticmethod
+    def make_key(method, url, params=None):
+        """Stable key for a request - parameter order does not matter"""
+        if isinstance(params, dict):
+            params = urlencode(sorted((str(k), str(v)) for k, v in params.items()))
+        raw = f"{method.upper()} {url} {params or ''}"
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    def _paths(self, key):
+        return (os.path.join(self.cache_dir, f'{key}.json'),
+                os.path.join(self.cache_dir, f'{key}.body'))
+
+    def _load_index(self):
+        """Build the LRU index from disk, oldest access first (lock held)"""
+        if self._index is not None:
+            return
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith('.body'):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, name[:-len('.body')], stat.st_size))
+
+        self._index = OrderedDict()
+        self._total = 0
+        for _, key, size in sorted(entries):
+            self._index[key] = size
+            self._total += size
+
+    def lookup(self, key):
+        """Return (meta, body) for a cached entry, or None"""
+        meta_path, body_path = self._paths(key)
+
+        with self._lock:
+            self._load_index()
+            if key not in self._index:
+                return None
+
+            try:
+                with open(meta_path, 'r') as f:
+                    meta = json.load(f)
+                with open(body_path, 'rb') as f:
+                    body = f.read()
+            except (OSError, ValueError):
+                self._discard(key)
+                return None
+
+            # Mark as most recently used, on disk too so the order survives restarts
+            self._index.move_to_end(key)
+            os.utime(body_path)
+            return meta, body
+
+    def is_fresh(self, meta, ttl):
+        """True if an entry is younger than ttl seconds"""
+        return ttl > 0 and time.time() - meta.get('stored_at', 0) < ttl
+
+    def store(self, key, response):
+        """
+        Cache a 200 response body with its validators
+
+        Error bodies sent with a 200 status are not cached, so a transient
+        server error is retried on the next request instead of being replayed
+        for the whole TTL.
+
+        Returns:
+            True if the response was cached
+        """
+        if ERROR_BODY.match(response.content[:64]):
+            return False
+
+        meta = {
+            'url': response.url,
+            'status_code': response.status_code,
+            'encoding': response.encoding,
+            'headers': {name: response.headers[name] for name in KEPT_HEADERS if name in response.headers},
+            'stored_at': time.time(),
+        }
+        self._write(key, meta, response.content)
+        return True
+
+    def refresh(self, key, meta, body, headers):
+        """Restart an entry's TTL after a 304, picking up any new validators"""
+        meta = dict(meta)
+        for name in ('ETag', 'Last-Modified', 'Date'):
+            if name in headers:
+                meta['headers'][name] = headers[name]
+        meta['stored_at'] = time.time()
+        self._write(key, meta, body)
+
+    def _write(self, key, meta, body):
+        meta_path, body_path = self._paths(key)
+
+        with self._lock:
+            self._load_index()
+            os.makedirs(self.cache_dir, exist_ok=True)
+
+            # Body first, then metadata, each via rename, so readers never see a torn entry
+            for path, data, mode in ((body_path, body, 'wb'), (meta_path, json.dumps(meta), 'w')):
+                tmp_path = f"{path}.{threading.get_ident()}.tmp"
+                with open(tmp_path, mode) as f:
+                    f.write(data)
+                os.replace(tmp_path, path)
+
+            self._total -= self._index.pop(key, 0)
+            self._index[key] = len(body)
+            self._total += len(body)
+            self._evict()
+
+    def _discard(self, key):
+        """Remove an entry from disk and the index (lock held)"""
+        for path in self._paths(key):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        self._total -= self._index.pop(key, 0)
+
+    def _evict(self):
+        """Drop least recently used entries until under the byte budget (lock held)"""
+        while self._total > self.max_bytes and len(self._index) > 1:
+            oldest = next(iter(self._index))
+            self._discard(oldest)
+
+    def clear(self):
+        """Remove every cached entry"""
+        with self._lock:
+            self._load_index()
+            for key in list(self._index):
+                self._discard(key)
+
+    @staticmethod
+    def to_response(meta, body):
+        """Rebuild a requests.Response from a cached entry"""
+        response = requests.Response()
+        response.status_code = meta.get('status_code', 200)
+        response.url = meta.get('url')
+        response.encoding = meta.get('encoding')
+        response.headers = CaseInsensitiveDict(meta.get('headers', {}))
+        response._content = body
+        response._content_consumed = True
+        response.from_cache = True
+        return response
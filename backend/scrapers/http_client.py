@@ -0,0 +1,177 @@
+"""
+Pooled keep-alive HTTP client shared by all scrapers
+
+One requests.Session is shared process-wide, with a connection pool mounted
+per host, so multi-page pulls and concurrent cities reuse their TCP+TLS
+connections instead of opening one per request. Responses pass through an
+optional on-disk cache (see http_cache.py), so reruns within a host's
+cache_ttl are served locally or revalidated with a conditional request.
+Network requests are paced per host by an adaptive rate limiter (see
+rate_limit.py).
+"""
+import threading
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from http_cache import ResponseCache
+from rate_limit import HostRateLimiter
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36',
+    'Accept-Encoding': 'gzip, deflate',
+    'Connection': 'keep-alive',
+}
+
+# Settings used for any host without an entry in HOST_CONFIG
+DEFAULT_HOST_CONFIG = {
+    'pool_size': 10,     # connections kept open to the host
+    'keep_alive': True,  # reuse connections between requests
+    'timeout': 30,       # seconds, or a (connect, read) tuple
+    'cache_ttl': 3600,   # seconds a cached response is served without revalidation
+    'rate': 4,           # starting requests/second
+    'burst': 4,          # requests allowed back-to-back
+    'min_rate': 0.5,     # floor after repeated throttling
+    'max_rate': 20,      # ceiling while the host keeps up
+}
+
+# Per-host overrides - the ArcGIS host is shared by several cities
+HOST_CONFIG = {
+    'services.arcgis.com': {'pool_size': 16, 'timeout': (10, 60), 'rate': 8, 'burst': 8, 'max_rate': 30},
+    'data.austintexas.gov': {'pool_size': 8},
+    'data.nashville.gov': {'pool_size': 8},
+}
+
+
+class HttpClient:
+    """requests.Session wrapper with a per-host connection pool and defaults"""
+
+    def __init__(self, host_config=None, default_config=None, headers=None, cache=None):
+        self.host_config = dict(HOST_CONFIG if host_config is None else host_config)
+        self.default_config = dict(DEFAULT_HOST_CONFIG)
+        self.default_config.update(default_config or {})
+
+        self.session = requests.Session()
+        self.session.headers.update(DEFAULT_HEADERS)
+        self.session.headers.update(headers or {})
+
+        self.cache = cache
+        self.limiter = HostRateLimiter(self.config_for)
+
+        self._lock = threading.Lock()
+        self._mounted = set()
+
+    @property
+    def headers(self):
+        return self.session.headers
+
+    def config_for(self, host):
+        """Return the effective settings for a host"""
+        config = dict(self.default_config)
+        config.update(self.host_config.get(host, {}))
+        return config
+
+    def _mount(self, scheme, host):
+        """Mount a dedicated connection pool for a host the first time it is used"""
+        key = (scheme, host)
+        if key in self._mounted:
+            return
+
+        with self._lock:
+            if key in self._mounted:
+                return
+            config = self.config_for(host)
+            adapter = HTTPAdapter(
+                pool_connections=1,
+                pool_maxsize=config['pool_size'],
+                max_retries=0,  # retries are handled by utils.retry_with_backoff
+            )
+            self.session.mount(f"{scheme}://{host}", adapter)
+            self._mounted.add(key)
+
+    def request(self, method, url, cache=None, **kwargs):
+        """
+        Send a request through the pooled session
+
+        Args:
+            cache: Use the response cache for this request (default: GET only;
+                   pass True for idempotent POST queries). Streamed requests
+                   (stream=True) always go to the network: their body is
+                   decoded as it arrives and never buffered, so there is
+                   nothing to cache.
+        """
+        parsed = urlparse(url)
+        self._mount(parsed.scheme, parsed.hostname)
+
+        config = self.config_for(parsed.hostname)
+        kwargs.setdefault('timeout', config['timeout'])
+        headers = dict(kwargs.pop('headers', None) or {})
+        if not config['keep_alive']:
+            headers.setdefault('Connection', 'close')
+
+        if cache is None:
+            cache = method.upper() == 'GET'
+        if kwargs.get('stream'):
+            cache = False
+        if not cache or self.cache is None:
+            return self._send(parsed.hostname, method, url, headers=headers, **kwargs)
+
+        key = self.cache.make_key(method, url, kwargs.get('params') or kwargs.get('data'))
+        entry = self.cache.lookup(key)
+
+        if entry:
+            meta, body = entry
+            if self.cache.is_fresh(meta, config['cache_ttl']):
+                return self.cache.to_response(meta, body)
+
+            # Stale - ask the server whether our copy is still current
+            if 'ETag' in meta['headers']:
+                headers['If-None-Match'] = meta['headers']['ETag']
+            if 'Last-Modified' in meta['headers']:
+                headers['If-Modified-Since'] = meta['headers']['Last-Modified']
+
+        response = self._send(parsed.hostname, method, url, headers=headers, **kwargs)
+
+        if response.status_code == 304 and entry:
+            self.cache.refresh(key, meta, body, response.headers)
+            return self.cache.to_response(meta, body)
+        if response.status_code == 200:
+            self.cache.store(key, response)
+        return response
+
+    def _send(self, host, method, url, **kwargs):
+        """Send a request over the network, paced by the host's rate limiter"""
+        self.limiter.acquire(host)
+        try:
+            response = self.session.request(method, url, **kwargs)
+        except (requests.exceptions.Timeout, requests.exceptions.ConnectionError):
+            self.limiter.on_error(host)
+            raise
+
+        self.limiter.feedback(host, response)
+        return response
+
+    def get(self, url, params=None, **kwargs):
+        return self.request('GET', url, params=params, **kwargs)
+
+    def post(self, url, data=None, **kwargs):
+        return self.request('POST', url, data=data, **kwargs)
+
+    def close(self):
+        self.session.close()
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_http_client():
+    """Return the process-wide HttpClient, creating it on first use"""
+    global _client
+
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = HttpClient(cache=ResponseCache())
+    return _client
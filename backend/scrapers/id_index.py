@@ -0,0 +1,180 @@
+"""
+Persistent per-city index of permit IDs seen by previous runs
+
+seen_permit_ids only dedupes within one run, so every daily CSV used to
+repeat the whole 30-day window. PermitIndex keeps each permit number with a
+fingerprint of its fields in a small SQLite table under backend/state, so a
+run can tell new and changed permits from ones it already delivered. A Bloom
+filter loaded at start-up answers "definitely new" without touching the
+database; only possible repeats are looked up, one query per page.
+"""
+import hashlib
+import math
+import os
+import sqlite3
+import threading
+from datetime import datetime
+
+from utils import STATE_DIR
+
+NEW = 'new'
+CHANGED = 'changed'
+UNCHANGED = 'unchanged'
+
+# Fields whose change makes a known permit worth delivering again
+FINGERPRINT_FIELDS = ('address', 'type', 'value', 'issued_date', 'status')
+
+# SQLite caps host parameters per statement (999 on older builds)
+LOOKUP_CHUNK = 900
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings"""
+
+    def __init__(self, capacity, error_rate=0.01):
+        capacity = max(capacity, 1000)
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.num_bits = int(-capacity * math.log(error_rate) / (math.log(2) ** 2))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self.bits = bytearray((self.num_bits + 7) // 8)
+        self.count = 0
+
+    def _positions(self, key):
+        digest = hashlib.blake2b(key.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return [(h1 + i * h2) % self.num_bits for i in range(self.num_hashes)]
+
+    def add(self, key):
+        for position in self._positions(key):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, key):
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+
+def fingerprint(permit):
+    """Short hash of a permit's deliverable fields"""
+    text = '\x1f'.join(str(getattr(permit, field, '')) for field in FINGERPRINT_FIELDS)
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=8).hexdigest()
+
+
+class PermitIndex:
+    """Permit numbers (and field fingerprints) already delivered for one city"""
+
+    def __init__(self, scraper_name, use_bloom=True):
+        self.scraper_name = scraper_name
+        self.db_file = os.path.join(STATE_DIR, f'{scraper_name}_ids.sqlite')
+        self.use_bloom = use_bloom
+        self._conn = None
+        self._bloom = None
+        self._pending = {}  # permit_number -> fingerprint, written by commit()
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        if self._conn is None:
+            os.makedirs(STATE_DIR, exist_ok=True)
+            self._conn = sqlite3.connect(self.db_file, check_same_thread=False)
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS permit_ids (
+                    permit_number TEXT PRIMARY KEY,
+                    fingerprint TEXT NOT NULL,
+                    first_seen TEXT NOT NULL,
+                    last_changed TEXT NOT NULL
+                ) WITHOUT ROWID
+            """)
+            self._conn.execute("CREATE INDEX IF NOT EXISTS permit_ids_first_seen ON permit_ids (first_seen)")
+            self._conn.commit()
+
+            if self.use_bloom:
+                total = self._conn.execute("SELECT COUNT(*) FROM permit_ids").fetchone()[0]
+                self._bloom = BloomFilter(total * 2)
+                for (permit_number,) in self._conn.execute("SELECT permit_number FROM permit_ids"):
+                    self._bloom.add(permit_number)
+        return self._conn
+
+    def _known_fingerprints(self, permit_numbers):
+        conn = self._connect()
+        if self._bloom is not None:
+            permit_numbers = [number for number in permit_numbers if number in self._bloom]
+
+        known = {}
+        for i in range(0, len(permit_numbers), LOOKUP_CHUNK):
+            chunk = permit_numbers[i:i + LOOKUP_CHUNK]
+            placeholders = ','.join('?' * len(chunk))
+            known.update(conn.execute(
+                f"SELECT permit_number, fingerprint FROM permit_ids WHERE permit_number IN ({placeholders})",
+                chunk
+            ))
+        return known
+
+    def classify(self, permits):
+        """
+        Sort a page of permits into new / changed / unchanged
+
+        Args:
+            permits: Permit records
+
+        Returns:
+            List of NEW, CHANGED or UNCHANGED, in the order of permits. New and
+            changed permits are remembered and written to disk by commit().
+        """
+        with self._lock:
+            prints = [fingerprint(permit) for permit in permits]
+            known = self._known_fingerprints([permit.permit_number for permit in permits])
+
+            states = []
+            for permit, print_ in zip(permits, prints):
+                previous = known.get(permit.permit_number)
+                if previous is None:
+                    states.append(NEW)
+                elif previous != print_:
+                    states.append(CHANGED)
+                else:
+                    states.append(UNCHANGED)
+                    continue
+                self._pending[permit.permit_number] = print_
+            return states
+
+    def commit(self):
+        """Persist the permits classified since the last commit (call after a successful save)"""
+        with self._lock:
+            if not self._pending:
+                return 0
+
+            conn = self._connect()
+            now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            with conn:
+                conn.executemany("""
+                    INSERT INTO permit_ids (permit_number, fingerprint, first_seen, last_changed)
+                    VALUES (?, ?, ?, ?)
+                    ON CONFLICT (permit_number) DO UPDATE SET
+                        fingerprint = excluded.fingerprint,
+                        last_changed = excluded.last_changed
+                """, [(number, print_, now, now) for number, print_ in self._pending.items()])
+
+            if self._bloom is not None:
+                if self._bloom.count + len(self._pending) > self._bloom.capacity:
+                    self._bloom = None  # rebuilt, larger, on next use
+                    self._conn.close()
+                    self._conn = None
+                else:
+                    for number in self._pending:
+                        if number not in self._bloom:
+                            self._bloom.add(number)
+
+            written = len(self._pending)
+            self._pending = {}
+            return written
+
+    def count_new_since(self, since):
+        """Number of permits first seen at or after a 'YYYY-MM-DD[ HH:MM:SS]' time"""
+        conn = self._connect()
+        return conn.execute("SELECT COUNT(*) FROM permit_ids WHERE first_seen >= ?", (since,)).fetchone()[0]
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
@@ -0,0 +1,172 @@
+"""
+Incremental JSON decoding for permit pages
+
+Data pages are requested with stream=True and decoded here as the body
+arrives: each array item is handed to the C scanner behind json.loads as
+soon as its bytes are in, so decoding overlaps the download, and neither the
+raw body nor the envelope around the records (ArcGIS "features" wrappers,
+"fields" metadata) is ever held in full. The page still comes back as one
+list - the engine normalizes whole columns per page - but it is ready as
+soon as the last byte lands instead of after a separate json.loads pass.
+"""
+import re
+import json
+import codecs
+
+WHITESPACE = re.compile(r'[ \t\n\r]*')
+CHUNK_SIZE = 64 * 1024
+DELIMITERS = frozenset(' \t\n\r,]}:')
+
+_scan_once = json.JSONDecoder().scan_once
+
+
+class _Reader:
+    """Text buffer over an iterator of byte chunks"""
+
+    def __init__(self, chunks):
+        self.chunks = iter(chunks)
+        self.utf8 = codecs.getincrementaldecoder('utf-8')()
+        self.buf = ''
+        self.pos = 0
+        self.exhausted = False
+
+    def fill(self):
+        """Read one more chunk into the buffer; False once the stream is exhausted"""
+        if self.exhausted:
+            return False
+
+        for chunk in self.chunks:
+            if not chunk:
+                continue
+            # Drop consumed text so the buffer stays about one chunk long
+            self.buf = self.buf[self.pos:] + self.utf8.decode(chunk)
+            self.pos = 0
+            return True
+
+        self.buf = self.buf[self.pos:] + self.utf8.decode(b'', final=True)
+        self.pos = 0
+        self.exhausted = True
+        return False
+
+    def peek(self):
+        """Return the next non-whitespace character, or '' at end of stream"""
+        while True:
+            self.pos = WHITESPACE.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self.fill():
+                return ''
+
+    def expect(self, char):
+        if self.peek() != char:
+            found = self.buf[self.pos:self.pos + 20] or 'end of stream'
+            raise ValueError(f"Expected '{char}' in JSON stream, found {found!r}")
+        self.pos += 1
+
+    def value(self):
+        """Decode the next complete JSON value"""
+        self.peek()
+        while True:
+            try:
+                obj, end = _scan_once(self.buf, self.pos)
+            except (StopIteration, ValueError):
+                # Not all of the value has arrived yet (or the body is malformed)
+                if not self.fill():
+                    raise ValueError(f"Malformed JSON near {self.buf[self.pos:self.pos + 20]!r}")
+                continue
+
+            # Objects, arrays and strings end at a bracket or quote, but a number
+            # cut by a chunk boundary ("12" of "12.5") scans as a shorter number -
+            # only trust one that is followed by a delimiter
+            if (isinstance(obj, (dict, list, str)) or self.exhausted
+                    or (end < len(self.buf) and self.buf[end] in DELIMITERS)):
+                self.pos = end
+                return obj
+            self.fill()
+
+
+def _iter_array(reader):
+    """Yield the items of the array starting at the reader's position"""
+    reader.expect('[')
+    if reader.peek() == ']':
+        reader.pos += 1
+        return
+
+    skip = WHITESPACE.match
+    while True:
+        # Fast path: the item and the separator after it are already buffered
+        buf = reader.buf
+        try:
+            obj, end = _scan_once(buf, skip(buf, reader.pos).end())
+            end = skip(buf, end).end()
+            separator = buf[end]
+        except (StopIteration, ValueError, IndexError):
+            separator = None
+
+        if separator == ',' or separator == ']':
+            reader.pos = end + 1
+        else:
+            # Split by a chunk boundary - decode it as more of the body arrives
+            obj = reader.value()
+            separator = reader.peek()
+            reader.pos += 1
+
+        yield obj
+        if separator == ']':
+            return
+        if separator != ',':
+            raise ValueError(f"Malformed JSON array near {reader.buf[reader.pos - 1:reader.pos + 20]!r}")
+
+
+def iter_json_array(chunks, key=None):
+    """
+    Yield the items of a JSON array from a stream of byte chunks
+
+    Args:
+        chunks: Iterable of bytes (e.g. response.iter_content())
+        key: None for a top-level array (Socrata), or the name of a top-level
+             object member holding the array (e.g. 'features' for ArcGIS)
+
+    Raises:
+        ValueError: If the body is malformed, or is an {"error": ...} object
+    """
+    reader = _Reader(chunks)
+
+    if key is None:
+        yield from _iter_array(reader)
+        return
+
+    reader.expect('{')
+    if reader.peek() == '}':
+        return
+
+    while True:
+        name = reader.value()
+        reader.expect(':')
+
+        if name == key:
+            yield from _iter_array(reader)
+            return
+
+        member = reader.value()
+        if name == 'error':
+            message = member.get('message', member) if isinstance(member, dict) else member
+            raise ValueError(f"API error: {message}")
+
+        separator = reader.peek()
+        reader.pos += 1
+        if separator == '}':
+            return
+        if separator != ',':
+            raise ValueError(f"Malformed JSON object near {reader.buf[reader.pos - 1:reader.pos + 20]!r}")
+
+
+def iter_socrata_records(response, chunk_size=CHUNK_SIZE):
+    """Yield the row dicts of a streamed Socrata JSON response"""
+    return iter_json_array(response.iter_content(chunk_size=chunk_size))
+
+
+def iter_arcgis_attributes(response, chunk_size=CHUNK_SIZE):
+    """Yield features[*].attributes of a streamed ArcGIS query response"""
+    for feature in iter_json_array(response.iter_content(chunk_size=chunk_size), key='features'):
+        yield feature.get('attributes', {})
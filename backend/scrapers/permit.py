@@ -0,0 +1,77 @@
+"""
+Compact permit record
+
+Scrapers used to hold every permit as a 7-key dict, repeating the key strings
+and the same city/type/status values thousands of times. Permit keeps the
+fields in __slots__ and interns the categorical values, so a large backfill
+stores one copy of "Houston" or "Issued" however many permits share it.
+Records are serialized only at the CSV/API boundary (see schema.py).
+"""
+import logging
+import sys
+
+FIELDS = ('permit_number', 'address', 'type', 'value', 'issued_date', 'status', 'city', 'description')
+
+# Keys of the old dict layout (date, city, permit_type, permit_number,
+# address, description) that are named differently here
+LEGACY_KEYS = {'date': 'issued_date', 'permit_type': 'type'}
+
+logger = logging.getLogger(__name__)
+_reported = set()
+
+
+def _report_unknown(keys):
+    """Log each distinct set of keys that has no Permit field, once per process"""
+    keys = tuple(sorted(keys))
+    if keys not in _reported:
+        _reported.add(keys)
+        logger.warning(f"No permit field for {', '.join(keys)} - those values are dropped")
+
+
+def _intern(value):
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+class Permit:
+    """One normalized building permit"""
+
+    __slots__ = FIELDS
+
+    def __init__(self, permit_number, address='', type='N/A', value=0.0, issued_date='N/A',
+                 status='N/A', city='', description=''):
+        self.permit_number = permit_number
+        self.address = address
+        self.type = _intern(type)
+        self.value = value
+        self.issued_date = _intern(issued_date)
+        self.status = _intern(status)
+        self.city = _intern(city)
+        self.description = description
+
+    @classmethod
+    def from_dict(cls, row):
+        """
+        Build a permit from a dict (e.g. a CSV row)
+
+        Legacy keys (see LEGACY_KEYS) are mapped onto their field unless the
+        field itself is present; any other unknown key is logged and dropped.
+        """
+        fields = {}
+        unknown = []
+        for key, value in row.items():
+            field = LEGACY_KEYS.get(key, key)
+            if field not in FIELDS:
+                unknown.append(key)
+            elif field == key or field not in row:
+                fields[field] = value
+        if unknown:
+            _report_unknown(unknown)
+
+        return cls(fields.pop('permit_number', ''), **fields)
+
+    def to_dict(self):
+        return {field: getattr(self, field) for field in FIELDS}
+
+    def __repr__(self):
+        return f"Permit({self.permit_number!r}, {self.city!r}, {self.issued_date!r})"
+
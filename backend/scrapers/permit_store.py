@@ -0,0 +1,179 @@
+"""
+SQLite permit store - the system of record for scraped permits
+
+Every scraper upserts its permits into one typed table keyed on
+(city, permit_number), and the per-city CSVs under leads/ are exported from
+it. The database runs in WAL mode so readers ("last 7 days for Houston")
+never block the scrapers writing concurrently from run_scrapers.py, and an
+index on (city, issued_date) keeps date-window queries off full scans.
+"""
+import os
+import sqlite3
+import threading
+from datetime import datetime
+
+from batch_normalize import parse_valuations
+from permit import Permit
+
+DB_PATH = os.path.join(os.path.dirname(__file__), '../data/permits.sqlite')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS permits (
+    city TEXT NOT NULL,
+    permit_number TEXT NOT NULL,
+    address TEXT,
+    type TEXT,
+    value REAL,
+    issued_date TEXT,          -- YYYY-MM-DD, NULL when unknown
+    status TEXT,
+    description TEXT,
+    first_seen TEXT NOT NULL,
+    updated_at TEXT NOT NULL,  -- last time any field changed
+    PRIMARY KEY (city, permit_number)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS permits_city_issued ON permits (city, issued_date);
+CREATE INDEX IF NOT EXISTS permits_city_updated ON permits (city, updated_at);
+"""
+
+# Only rows whose fields actually changed get a new updated_at
+UPSERT = """
+INSERT INTO permits (city, permit_number, address, type, value, issued_date, status, description,
+                     first_seen, updated_at)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (city, permit_number) DO UPDATE SET
+    address = excluded.address,
+    type = excluded.type,
+    value = excluded.value,
+    issued_date = excluded.issued_date,
+    status = excluded.status,
+    description = excluded.description,
+    updated_at = excluded.updated_at
+WHERE (permits.address, permits.type, permits.value, permits.issued_date, permits.status, permits.description)
+      IS NOT (excluded.address, excluded.type, excluded.value, excluded.issued_date, excluded.status,
+              excluded.description)
+"""
+
+COLUMNS = 'permit_number, address, type, value, issued_date, status, city, description'
+
+# Columns added after the first release, created on databases that predate them
+MIGRATIONS = {'description': 'ALTER TABLE permits ADD COLUMN description TEXT'}
+
+
+def _date_or_none(value):
+    value = str(value or '')
+    return value[:10] if value[:1].isdigit() else None
+
+
+class PermitStore:
+    """Thread-safe access to the permits database (one connection per thread)"""
+
+    def __init__(self, db_path=DB_PATH, batch_size=1000):
+        self.db_path = db_path
+        self.batch_size = batch_size
+        self._local = threading.local()
+        self._schema_lock = threading.Lock()
+        self._schema_ready = False
+
+    def connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            with self._schema_lock:
+                if not self._schema_ready:
+                    conn.executescript(SCHEMA)
+                    existing = {row[1] for row in conn.execute("PRAGMA table_info(permits)")}
+                    for name, statement in MIGRATIONS.items():
+                        if name not in existing:
+                            conn.execute(statement)
+                    self._schema_ready = True
+            self._local.conn = conn
+        return conn
+
+    def upsert(self, city, permits):
+        """
+        Insert or update permits for a city in batched transactions
+
+        Args:
+            city: City name the permits belong to
+            permits: Permit records (dicts with a permit_number are accepted too)
+
+        Returns:
+            Number of rows inserted or changed
+        """
+        records = [p if isinstance(p, Permit) else Permit.from_dict(p)
+                   for p in permits if isinstance(p, Permit) or p.get('permit_number')]
+        if not records:
+            return 0
+
+        conn = self.connection()
+        now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        values = parse_valuations([permit.value for permit in records]).tolist()
+        changed = 0
+
+        for start in range(0, len(records), self.batch_size):
+            batch = records[start:start + self.batch_size]
+            rows = [
+                (city, str(permit.permit_number), permit.address, permit.type, value,
+                 _date_or_none(permit.issued_date), permit.status, permit.description, now, now)
+                for permit, value in zip(batch, values[start:start + self.batch_size])
+            ]
+            with conn:
+                before = conn.total_changes
+                conn.executemany(UPSERT, rows)
+                changed += conn.total_changes - before
+
+        return changed
+
+    def query(self, city, issued_since=None, issued_until=None, updated_since=None):
+        """
+        Permits for a city, newest issue date first
+
+        Args:
+            city: City name
+            issued_since / issued_until: Inclusive YYYY-MM-DD bounds on issued_date
+            updated_since: Only rows inserted or changed at or after this time
+
+        Returns:
+            List of Permit records
+        """
+        where = ["city = ?"]
+        params = [city]
+        if issued_since:
+            where.append("issued_date >= ?")
+            params.append(issued_since)
+        if issued_until:
+            where.append("issued_date <= ?")
+            params.append(issued_until)
+        if updated_since:
+            where.append("updated_at >= ?")
+            params.append(updated_since)
+
+        cursor = self.connection().execute(
+            f"SELECT {COLUMNS} FROM permits WHERE {' AND '.join(where)} "
+            f"ORDER BY issued_date DESC, permit_number",
+            params
+        )
+        return [Permit(number, address, type_, value or 0.0, issued or 'N/A', status, city_, description or '')
+                for number, address, type_, value, issued, status, city_, description in cursor]
+
+    def count(self, city=None):
+        if city is None:
+            return self.connection().execute("SELECT COUNT(*) FROM permits").fetchone()[0]
+        return self.connection().execute("SELECT COUNT(*) FROM permits WHERE city = ?", (city,)).fetchone()[0]
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_permit_store():
+    """Return the process-wide permit store, creating it on first use"""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = PermitStore()
+    return _store
@@ -0,0 +1,116 @@
+"""
+Per-host adaptive rate limiting for scraper requests
+
+Every request through the shared HttpClient takes a token from its host's
+bucket. The bucket's refill rate adapts AIMD-style: it creeps up while the
+host answers normally and halves when the host throttles (429/503) or times
+out. Retry-After and X-RateLimit-* headers pause the whole host, so
+concurrent cities sharing a portal back off together.
+"""
+import time
+import threading
+
+from utils import parse_retry_after
+
+# Statuses that mean "slow down"
+THROTTLE_STATUSES = (429, 503)
+
+
+class TokenBucket:
+    """Thread-safe token bucket with an adjustable refill rate"""
+
+    def __init__(self, rate, burst, min_rate, max_rate, increase=0.5, decrease=0.5):
+        self.rate = float(rate)
+        self.burst = float(burst)
+        self.min_rate = float(min_rate)
+        self.max_rate = float(max_rate)
+        self.increase = increase  # requests/s added per successful response
+        self.decrease = decrease  # rate multiplier on throttling
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.lock = threading.Lock()
+
+    def _refill(self, now):
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self):
+        """Block until a token is available (and any host pause has passed)"""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self._refill(now)
+                if now >= self.blocked_until and self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = max(self.blocked_until - now, (1 - self.tokens) / self.rate)
+            time.sleep(min(wait, 5))
+
+    def on_success(self):
+        with self.lock:
+            self.rate = min(self.max_rate, self.rate + self.increase)
+
+    def on_throttle(self, pause=None):
+        with self.lock:
+            self.rate = max(self.min_rate, self.rate * self.decrease)
+            self.tokens = min(self.tokens, 0)
+            if pause:
+                self.blocked_until = max(self.blocked_until, time.monotonic() + pause)
+
+    def pause(self, seconds):
+        with self.lock:
+            self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+
+
+class HostRateLimiter:
+    """One adaptive token bucket per host"""
+
+    def __init__(self, config_for):
+        """
+        Args:
+            config_for: Callable returning a host's settings (rate, burst,
+                        min_rate, max_rate) - usually HttpClient.config_for
+        """
+        self.config_for = config_for
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def bucket(self, host):
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            with self._lock:
+                bucket = self._buckets.get(host)
+                if bucket is None:
+                    config = self.config_for(host)
+                    bucket = TokenBucket(config['rate'], config['burst'],
+                                         config['min_rate'], config['max_rate'])
+                    self._buckets[host] = bucket
+        return bucket
+
+    def acquire(self, host):
+        self.bucket(host).acquire()
+
+    def feedback(self, host, response):
+        """Adapt a host's rate from a response's status and rate-limit headers"""
+        bucket = self.bucket(host)
+
+        if response.status_code in THROTTLE_STATUSES:
+            bucket.on_throttle(parse_retry_after(response))
+            return
+
+        remaining = response.headers.get('X-RateLimit-Remaining')
+        if remaining is not None and remaining.strip().isdigit() and int(remaining) == 0:
+            reset = response.headers.get('X-RateLimit-Reset', '')
+            if reset.strip().isdigit():
+                reset = int(reset)
+                # Some hosts send seconds-until-reset, others an epoch timestamp
+                bucket.pause(reset - time.time() if reset > 10 ** 9 else reset)
+            return
+
+        if response.status_code < 400:
+            bucket.on_success()
+
+    def on_error(self, host):
+        """Treat a timeout or dropped connection as a sign of overload"""
+        self.bucket(host).on_throttle()
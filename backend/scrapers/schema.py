@@ -0,0 +1,137 @@
+"""
+Declared permit output schema and its serializer
+
+Every scraper writes the same typed layout - the columns below, in this
+order - whether its permits came from an API page, a portal table or the
+permit store. PermitSerializer turns Permit records into CSV, JSON or NDJSON
+rows with one attrgetter call per record and the per-column formatting
+decided once up front, instead of DictWriter re-checking dict keys on every
+row.
+"""
+import csv
+import json
+import os
+from operator import attrgetter
+
+from batch_normalize import format_valuation
+from permit import Permit
+
+
+class Column:
+    """One output column: name, type ('str', 'float' or 'date') and CSV formatter"""
+
+    def __init__(self, name, type='str', csv_format=None):
+        self.name = name
+        self.type = type
+        self.csv_format = csv_format
+
+    def __repr__(self):
+        return f"Column({self.name!r}, {self.type!r})"
+
+
+PERMIT_SCHEMA = (
+    Column('permit_number'),
+    Column('address'),
+    Column('type'),
+    Column('value', 'float', csv_format=format_valuation),
+    Column('issued_date', 'date'),
+    Column('status'),
+    Column('city'),
+    Column('description'),
+)
+
+FORMATS = ('csv', 'json', 'ndjson')
+
+
+def _json_float(value):
+    if isinstance(value, (int, float)):
+        return float(value)
+    try:
+        return float(str(value).replace('$', '').replace(',', ''))
+    except ValueError:
+        return None
+
+
+def _json_date(value):
+    value = str(value or '')
+    return value[:10] if value[:1].isdigit() else None
+
+
+JSON_CONVERTERS = {'float': _json_float, 'date': _json_date}
+
+
+class PermitSerializer:
+    """Write permits in the declared schema as CSV, JSON or NDJSON"""
+
+    def __init__(self, schema=PERMIT_SCHEMA, city=None):
+        """
+        Args:
+            schema: Sequence of Column
+            city: City name written when a permit has none
+        """
+        self.schema = tuple(schema)
+        self.fieldnames = [column.name for column in self.schema]
+        self._values = attrgetter(*self.fieldnames)
+
+        self._csv_formats = [(i, column.csv_format) for i, column in enumerate(self.schema)
+                             if column.csv_format]
+        self._json_formats = [(i, JSON_CONVERTERS[column.type]) for i, column in enumerate(self.schema)
+                              if column.type in JSON_CONVERTERS]
+        if city and 'city' in self.fieldnames:
+            fill_city = (self.fieldnames.index('city'), lambda value: value or city)
+            self._csv_formats.append(fill_city)
+            self._json_formats.append(fill_city)
+
+    def records(self, permits):
+        """Permit records for a mix of Permits and dicts (see Permit.from_dict)"""
+        return [p if isinstance(p, Permit) else Permit.from_dict(p) for p in permits]
+
+    def csv_row(self, permit):
+        row = list(self._values(permit))
+        for i, fmt in self._csv_formats:
+            row[i] = fmt(row[i])
+        return row
+
+    def json_record(self, permit):
+        row = list(self._values(permit))
+        for i, convert in self._json_formats:
+            row[i] = convert(row[i])
+        return dict(zip(self.fieldnames, row))
+
+    def write_csv(self, fileobj, permits, header=True):
+        writer = csv.writer(fileobj)
+        if header:
+            writer.writerow(self.fieldnames)
+        writer.writerows(map(self.csv_row, permits))
+
+    def write_json(self, fileobj, permits):
+        json.dump([self.json_record(permit) for permit in permits], fileobj)
+
+    def write_ndjson(self, fileobj, permits):
+        dumps = json.dumps
+        fileobj.writelines(dumps(self.json_record(permit)) + '\n' for permit in permits)
+
+    def write(self, path, permits, format=None):
+        """
+        Write permits to a file, atomically replacing any existing one
+
+        Args:
+            path: Output path
+            permits: Permit records (dicts are converted)
+            format: 'csv', 'json' or 'ndjson' (default: from the file extension)
+
+        Returns:
+            The path written
+        """
+        format = format or os.path.splitext(path)[1].lstrip('.').lower()
+        if format not in FORMATS:
+            raise ValueError(f"Unsupported output format: {format}")
+
+        permits = self.records(permits)
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', newline='' if format == 'csv' else None, encoding='utf-8') as f:
+            getattr(self, f'write_{format}')(f, permits)
+        os.replace(tmp_path, path)
+        return path
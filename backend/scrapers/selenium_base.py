@@ -6,27 +6,100 @@ from datetime import datetime, timedelta
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.options import Options
-from selenium.common.exceptions import TimeoutException, NoSuchElementException, WebDriverException
+from selenium.common.exceptions import TimeoutException, WebDriverException
 import time
-import csv
 import os
-from .utils import setup_logger, ScraperHealthCheck
+from utils import setup_logger, ScraperHealthCheck, LearnedSelectors
+from driver_pool import get_driver_pool, DriverPoolTimeout
+from permit import Permit
+from schema import PermitSerializer
+from permit_store import get_permit_store
+
+BY_TYPE = {
+    'css': By.CSS_SELECTOR,
+    'xpath': By.XPATH,
+}
+
+# Runs in the page: resolve [type, selector] pairs in order and return the
+# trimmed text of every node matched by the first pair that matches anything
+EXTRACT_TEXTS_JS = """
+const selectors = arguments[0];
+function find(type, selector) {
+    if (type === 'css') return Array.from(document.querySelectorAll(selector));
+    const snapshot = document.evaluate(selector, document, null,
+                                       XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+    const nodes = [];
+    for (let i = 0; i < snapshot.snapshotLength; i++) nodes.push(snapshot.snapshotItem(i));
+    return nodes;
+}
+for (let i = 0; i < selectors.length; i++) {
+    let nodes;
+    try { nodes = find(selectors[i][0], selectors[i][1]); } catch (e) { continue; }
+    if (nodes.length) {
+        return {index: i, texts: nodes.map(n => (n.innerText || n.textContent || '').trim())};
+    }
+}
+return null;
+"""
+
+# Runs in the page: return a table's header and body cell texts as JSON rows
+EXTRACT_TABLE_JS = """
+const type = arguments[0], selector = arguments[1];
+const table = type === 'css'
+    ? document.querySelector(selector)
+    : document.evaluate(selector, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+if (!table || !table.rows) return null;
+const text = cell => (cell.innerText || cell.textContent || '').trim();
+let rows = Array.from(table.rows);
+let header = [];
+if (table.tHead && table.tHead.rows.length) {
+    header = Array.from(table.tHead.rows[0].cells).map(text);
+    rows = rows.filter(row => row.parentNode !== table.tHead);
+} else if (rows.length && rows[0].querySelector('th')) {
+    header = Array.from(rows[0].cells).map(text);
+    rows = rows.slice(1);
+}
+return {header: header, rows: rows.map(row => Array.from(row.cells).map(text))};
+"""
 
 class SeleniumScraperBase:
     """
     Base class for Selenium-based web scrapers with auto-recovery
     """
 
-    def __init__(self, city_name, url, logger_name=None):
+    # Root of the leads/<city>/<date>/ tree (run_scrapers.py sets an absolute path)
+    output_dir = 'leads'
+
+    # Warm browsers shared by every Selenium scraper in the process (0 = no pool)
+    driver_pool_size = 2
+
+    # Requests blocked in data-only mode: images, fonts, stylesheets and
+    # third-party analytics/font hosts - none of them carry permit data
+    blocked_url_patterns = [
+        '*.png', '*.jpg', '*.jpeg', '*.gif', '*.svg', '*.webp', '*.ico',
+        '*.woff', '*.woff2', '*.ttf', '*.otf', '*.eot',
+        '*.css',
+        '*google-analytics.com*', '*googletagmanager.com*', '*doubleclick.net*',
+        '*fonts.googleapis.com*', '*fonts.gstatic.com*', '*facebook.net*',
+        '*hotjar.com*', '*newrelic.com*', '*nr-data.net*',
+    ]
+
+    def __init__(self, city_name, url, logger_name=None, use_driver_pool=True, data_only=False):
         self.city_name = city_name
         self.url = url
+        self.data_only = data_only
         self.permits = []
         self.seen_permit_ids = set()
         self.logger = setup_logger(logger_name or city_name.lower().replace(' ', ''))
         self.health_check = ScraperHealthCheck(city_name.lower().replace(' ', ''))
+        self.learned_selectors = LearnedSelectors(city_name.lower().replace(' ', ''))
         self.driver = None
+        self.driver_pool = None
+        if use_driver_pool and self.driver_pool_size > 0:
+            profile = 'data-only' if data_only else 'default'
+            self.driver_pool = get_driver_pool(profile, self._chrome_options,
+                                               size=self.driver_pool_size, logger=self.logger)
 
         # Selectors to try for common permit data (auto-fix attempts)
         self.selector_attempts = {
@@ -53,19 +126,54 @@ class SeleniumScraperBase:
             ]
         }
 
+    def _chrome_options(self):
+        """Build the headless Chrome options used for every driver"""
+        chrome_options = Options()
+        chrome_options.add_argument('--headless')
+        chrome_options.add_argument('--no-sandbox')
+        chrome_options.add_argument('--disable-dev-shm-usage')
+        chrome_options.add_argument('--disable-gpu')
+        chrome_options.add_argument('--window-size=1920,1080')
+        chrome_options.add_argument('--user-agent=Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36')
+
+        if self.data_only:
+            # Hand the page over as soon as the DOM is parsed, and never fetch images
+            chrome_options.page_load_strategy = 'eager'
+            chrome_options.add_argument('--blink-settings=imagesEnabled=false')
+            chrome_options.add_experimental_option('prefs', {
+                'profile.managed_default_content_settings.images': 2,
+                'profile.default_content_setting_values.notifications': 2,
+            })
+        return chrome_options
+
+    def _apply_data_only(self):
+        """Block fonts, stylesheets and third-party hosts on the current driver"""
+        if not self.data_only:
+            return
+        try:
+            self.driver.execute_cdp_cmd('Network.enable', {})
+            self.driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': self.blocked_url_patterns})
+        except WebDriverException as e:
+            self.logger.warning(f"Could not set URL blocklist: {e}")
+
     def _init_driver(self):
-        """Initialize headless Chrome driver with proper options"""
+        """Initialize headless Chrome driver - checked out of the shared pool when enabled"""
         try:
-            chrome_options = Options()
-            chrome_options.add_argument('--headless')
-            chrome_options.add_argument('--no-sandbox')
-            chrome_options.add_argument('--disable-dev-shm-usage')
-            chrome_options.add_argument('--disable-gpu')
-            chrome_options.add_argument('--window-size=1920,1080')
-            chrome_options.add_argument('--user-agent=Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36')
-
-            self.driver = webdriver.Chrome(options=chrome_options)
+            if self.driver_pool:
+                try:
+                    self.driver = self.driver_pool.acquire()
+                    self._apply_data_only()
+                    self.logger.info("Chrome driver checked out of pool")
+                    return True
+                except DriverPoolTimeout as e:
+                    # Every pooled browser is busy with a long scrape - use a
+                    # private driver (quit on close) rather than failing the city
+                    self.logger.warning(f"{e} - starting a private driver")
+                    self.driver_pool = None
+
+            self.driver = webdriver.Chrome(options=self._chrome_options())
             self.driver.set_page_load_timeout(30)
+            self._apply_data_only()
             self.logger.info("Chrome driver initialized successfully")
             return True
 
@@ -73,67 +181,154 @@ class SeleniumScraperBase:
             self.logger.error(f"Failed to initialize Chrome driver: {e}")
             return False
 
-    def _close_driver(self):
-        """Safely close the driver"""
+    def _close_driver(self, discard=False):
+        """Safely close the driver, or hand it back to the pool for reuse"""
         if self.driver:
             try:
-                self.driver.quit()
-                self.logger.info("Chrome driver closed")
+                if self.driver_pool:
+                    self.driver_pool.release(self.driver, discard=discard)
+                    self.logger.info("Chrome driver returned to pool")
+                else:
+                    self.driver.quit()
+                    self.logger.info("Chrome driver closed")
             except Exception as e:
                 self.logger.warning(f"Error closing driver: {e}")
+            finally:
+                self.driver = None
 
-    def _try_find_element(self, selector_list, timeout=5):
+    def _field_for(self, selector_list):
+        """Name of the selector_attempts field a selector list belongs to, if any"""
+        for field, attempts in self.selector_attempts.items():
+            if attempts is selector_list:
+                return field
+        return None
+
+    def _ordered_selectors(self, selector_list, field):
+        """Selector list with the one that won last time (for this field) first"""
+        selectors = [(t, sel) for t, sel in selector_list if t in BY_TYPE]
+        learned = self.learned_selectors.get(field) if field else None
+        if learned in selectors:
+            selectors.remove(learned)
+            selectors.insert(0, learned)
+        return selectors
+
+    def _locate(self, selector_list, timeout, field):
         """
-        Try multiple selectors to find an element (auto-fix capability)
-        Returns element if found, None otherwise
+        Find elements by the first selector that matches
+
+        Probes every selector once with find_elements (no waiting) and only
+        then polls them together for up to timeout seconds, so a page whose
+        working selector is last never pays one timeout per earlier selector.
+        The winner is remembered per field and tried first next time.
+
+        Returns (selector_type, selector, elements), or None
         """
-        for selector_type, selector in selector_list:
-            try:
-                if selector_type == 'css':
-                    element = WebDriverWait(self.driver, timeout).until(
-                        EC.presence_of_element_located((By.CSS_SELECTOR, selector))
-                    )
-                elif selector_type == 'xpath':
-                    element = WebDriverWait(self.driver, timeout).until(
-                        EC.presence_of_element_located((By.XPATH, selector))
-                    )
-                else:
+        field = field or self._field_for(selector_list)
+        selectors = self._ordered_selectors(selector_list, field)
+
+        def first_match(driver):
+            for selector_type, selector in selectors:
+                try:
+                    elements = driver.find_elements(BY_TYPE[selector_type], selector)
+                except WebDriverException:
                     continue
+                if elements:
+                    return selector_type, selector, elements
+            return False
 
-                self.logger.info(f"Found element with {selector_type}: {selector}")
-                return element
+        match = first_match(self.driver)
+        if not match and timeout > 0:
+            try:
+                match = WebDriverWait(self.driver, timeout).until(first_match)
+            except TimeoutException:
+                match = None
 
-            except (TimeoutException, NoSuchElementException):
-                continue
+        if match and field:
+            self.learned_selectors.remember(field, match[0], match[1])
+        return match or None
 
-        return None
+    def _try_find_element(self, selector_list, timeout=5, field=None):
+        """
+        Try multiple selectors to find an element (auto-fix capability)
+        Returns element if found, None otherwise
+        """
+        match = self._locate(selector_list, timeout, field)
+        if not match:
+            return None
+
+        selector_type, selector, elements = match
+        self.logger.info(f"Found element with {selector_type}: {selector}")
+        return elements[0]
 
-    def _try_find_elements(self, selector_list, timeout=5):
+    def _try_find_elements(self, selector_list, timeout=5, field=None):
         """
         Try multiple selectors to find elements (auto-fix capability)
         Returns list of elements if found, empty list otherwise
         """
-        for selector_type, selector in selector_list:
-            try:
-                if selector_type == 'css':
-                    elements = WebDriverWait(self.driver, timeout).until(
-                        EC.presence_of_all_elements_located((By.CSS_SELECTOR, selector))
-                    )
-                elif selector_type == 'xpath':
-                    elements = WebDriverWait(self.driver, timeout).until(
-                        EC.presence_of_all_elements_located((By.XPATH, selector))
-                    )
-                else:
-                    continue
+        match = self._locate(selector_list, timeout, field)
+        if not match:
+            return []
 
-                if elements:
-                    self.logger.info(f"Found {len(elements)} elements with {selector_type}: {selector}")
-                    return elements
+        selector_type, selector, elements = match
+        self.logger.info(f"Found {len(elements)} elements with {selector_type}: {selector}")
+        return elements
 
-            except (TimeoutException, NoSuchElementException):
-                continue
+    def extract_texts(self, selector_list, field=None):
+        """
+        Read the text of every node matched by the first working selector
 
-        return []
+        One execute_script call replaces a WebDriver round trip per element,
+        and the learned selector for the field is tried first.
+        Returns a list of strings (empty if nothing matched)
+        """
+        field = field or self._field_for(selector_list)
+        selectors = self._ordered_selectors(selector_list, field)
+
+        try:
+            result = self.driver.execute_script(EXTRACT_TEXTS_JS, [list(sel) for sel in selectors])
+        except WebDriverException as e:
+            self.logger.warning(f"Bulk text extraction failed: {e}")
+            return []
+
+        if not result:
+            return []
+
+        selector_type, selector = selectors[result['index']]
+        if field:
+            self.learned_selectors.remember(field, selector_type, selector)
+        self.logger.info(f"Extracted {len(result['texts'])} values with {selector_type}: {selector}")
+        return result['texts']
+
+    def extract_table(self, selector='table', selector_type='css', columns=None):
+        """
+        Read a whole results table in a single execute_script call
+
+        Args:
+            selector: CSS or XPath selector for the <table>
+            selector_type: 'css' or 'xpath'
+            columns: Optional keys for the cells, in column order; defaults to
+                     the table's own header row
+
+        Returns:
+            List of row dicts (list of cell lists if there is no header),
+            or an empty list if the table is not found
+        """
+        try:
+            result = self.driver.execute_script(EXTRACT_TABLE_JS, selector_type, selector)
+        except WebDriverException as e:
+            self.logger.warning(f"Table extraction failed for {selector}: {e}")
+            return []
+
+        if not result:
+            return []
+
+        keys = columns or result['header']
+        rows = result['rows']
+        self.logger.info(f"Extracted {len(rows)} table rows with {selector_type}: {selector}")
+
+        if not keys:
+            return rows
+        return [dict(zip(keys, row)) for row in rows if row]
 
     def _safe_get_text(self, element):
         """Safely extract text from element"""
@@ -148,6 +343,13 @@ class SeleniumScraperBase:
         """
         raise NotImplementedError("Subclass must implement scrape_permits method")
 
+    def add_permit(self, permit_number, **fields):
+        """Record a scraped permit as a compact Permit (see permit.FIELDS for the fields)"""
+        fields.setdefault('city', self.city_name)
+        permit = Permit(str(permit_number).strip(), **fields)
+        self.permits.append(permit)
+        return permit
+
     def save_to_csv(self, filename=None):
         """Save permits to CSV file"""
         if not self.permits:
@@ -157,15 +359,13 @@ class SeleniumScraperBase:
         if filename is None:
             today = datetime.now().strftime('%Y-%m-%d')
             city_slug = self.city_name.lower().replace(' ', '')
-            filename = f'leads/{city_slug}/{today}/{today}_{city_slug}.csv'
+            filename = os.path.join(self.output_dir, city_slug, today, f'{today}_{city_slug}.csv')
 
-        os.makedirs(os.path.dirname(filename), exist_ok=True)
+        changed = get_permit_store().upsert(self.city_name, self.permits)
+        self.logger.info(f"Stored {len(self.permits)} permits ({changed} inserted or changed)")
 
-        with open(filename, 'w', newline='', encoding='utf-8') as f:
-            if self.permits:
-                writer = csv.DictWriter(f, fieldnames=list(self.permits[0].keys()))
-                writer.writeheader()
-                writer.writerows(self.permits)
+        # Every scraper writes the declared permit schema (see schema.PERMIT_SCHEMA)
+        PermitSerializer(city=self.city_name).write(filename, self.permits, 'csv')
 
         self.logger.info(f"Saved {len(self.permits)} permits to {filename}")
         print(f"✅ Saved {len(self.permits)} permits to {filename}")
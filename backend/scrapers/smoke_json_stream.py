@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Smoke check for json_stream
+
+Decodes Socrata- and ArcGIS-shaped bodies split at every chunk size from 1
+byte up, compares the records with json.loads, and checks that truncated,
+malformed and {"error": ...} bodies raise ValueError.
+
+    python backend/scrapers/smoke_json_stream.py
+"""
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from json_stream import iter_json_array
+
+
+def chunked(body, size):
+    return [body[i:i + size] for i in range(0, len(body), size)]
+
+
+def decodes_like_json_loads(body, key=None, sizes=None):
+    expected = json.loads(body)
+    if key is not None:
+        expected = expected[key]
+    return all(list(iter_json_array(chunked(body, size), key=key)) == expected
+               for size in sizes or range(1, len(body) + 1))
+
+
+def raises_value_error(body, key=None):
+    try:
+        list(iter_json_array(chunked(body, 3), key=key))
+    except ValueError:
+        return True
+    return False
+
+
+def main():
+    rows = [{'permit_number': f'P{i}', 'value': i * 1250.5, 'issued': 1700000000000 + i,
+             'address': f'{i} Main St – Café', 'open': i % 2 == 0, 'note': None} for i in range(50)]
+
+    # Socrata pretty-prints "\n," between rows; ArcGIS sends compact JSON
+    socrata = ('[' + '\n,'.join(json.dumps(row) for row in rows) + '\n]\n').encode('utf-8')
+    arcgis = json.dumps({'objectIdFieldName': 'OBJECTID', 'fields': [{'name': 'value'}],
+                         'features': [{'attributes': row} for row in rows]}).encode('utf-8')
+    scalars = b'[1, 23456, -0.25, 1.5e10, "x", true, null, {"a": [1, 2]}]'
+
+    checks = {
+        'Socrata array, every chunk size': decodes_like_json_loads(socrata),
+        'ArcGIS features, every chunk size': decodes_like_json_loads(arcgis, 'features',
+                                                                     sizes=[1, 2, 7, 64, 4096]),
+        'numbers split at chunk edges': decodes_like_json_loads(scalars),
+        'empty array': decodes_like_json_loads(b'[]') and decodes_like_json_loads(b'{"features": []}', 'features'),
+        'ArcGIS error body raises': raises_value_error(
+            b'{"error": {"code": 500, "message": "Unable to complete operation."}}', 'features'),
+        'truncated body raises': raises_value_error(socrata[:-40]),
+        'missing separator raises': raises_value_error(b'[1 2]'),
+    }
+
+    for name, passed in checks.items():
+        print(f"{'✅' if passed else '❌'} {name}")
+    return 0 if all(checks.values()) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,152 @@
+"""
+Batch state validation for scraped addresses
+
+Catches data contamination (e.g. Philadelphia permits in the Phoenix folder)
+without re-reading config.json or recompiling patterns per permit. A
+StateValidator is built once per scraper and checks an address by, in order:
+a ", XX" state abbreviation, a trailing ZIP code's 3-digit prefix, and a
+full state name after a comma.
+"""
+import re
+from collections import Counter
+
+US_STATES = {
+    'AL': 'alabama', 'AK': 'alaska', 'AZ': 'arizona', 'AR': 'arkansas',
+    'CA': 'california', 'CO': 'colorado', 'CT': 'connecticut', 'DE': 'delaware',
+    'DC': 'district of columbia', 'FL': 'florida', 'GA': 'georgia', 'HI': 'hawaii',
+    'ID': 'idaho', 'IL': 'illinois', 'IN': 'indiana', 'IA': 'iowa',
+    'KS': 'kansas', 'KY': 'kentucky', 'LA': 'louisiana', 'ME': 'maine',
+    'MD': 'maryland', 'MA': 'massachusetts', 'MI': 'michigan', 'MN': 'minnesota',
+    'MS': 'mississippi', 'MO': 'missouri', 'MT': 'montana', 'NE': 'nebraska',
+    'NV': 'nevada', 'NH': 'new hampshire', 'NJ': 'new jersey', 'NM': 'new mexico',
+    'NY': 'new york', 'NC': 'north carolina', 'ND': 'north dakota', 'OH': 'ohio',
+    'OK': 'oklahoma', 'OR': 'oregon', 'PA': 'pennsylvania', 'RI': 'rhode island',
+    'SC': 'south carolina', 'SD': 'south dakota', 'TN': 'tennessee', 'TX': 'texas',
+    'UT': 'utah', 'VT': 'vermont', 'VA': 'virginia', 'WA': 'washington',
+    'WV': 'west virginia', 'WI': 'wisconsin', 'WY': 'wyoming',
+}
+
+# (first, last, state) ranges of 3-digit ZIP prefixes
+ZIP_PREFIX_RANGES = [
+    (5, 5, 'NY'), (10, 27, 'MA'), (28, 29, 'RI'), (30, 38, 'NH'), (39, 49, 'ME'),
+    (50, 54, 'VT'), (55, 55, 'MA'), (56, 59, 'VT'), (60, 69, 'CT'), (70, 89, 'NJ'),
+    (100, 149, 'NY'), (150, 196, 'PA'), (197, 199, 'DE'), (200, 200, 'DC'),
+    (201, 201, 'VA'), (202, 205, 'DC'), (206, 219, 'MD'), (220, 246, 'VA'),
+    (247, 268, 'WV'), (270, 289, 'NC'), (290, 299, 'SC'), (300, 319, 'GA'),
+    (320, 339, 'FL'), (341, 349, 'FL'), (350, 369, 'AL'), (370, 385, 'TN'),
+    (386, 397, 'MS'), (398, 399, 'GA'), (400, 427, 'KY'), (430, 459, 'OH'),
+    (460, 479, 'IN'), (480, 499, 'MI'), (500, 528, 'IA'), (530, 549, 'WI'),
+    (550, 567, 'MN'), (569, 569, 'DC'), (570, 577, 'SD'), (580, 588, 'ND'),
+    (590, 599, 'MT'), (600, 629, 'IL'), (630, 658, 'MO'), (660, 679, 'KS'),
+    (680, 693, 'NE'), (700, 714, 'LA'), (716, 729, 'AR'), (730, 732, 'OK'),
+    (733, 733, 'TX'), (734, 749, 'OK'), (750, 799, 'TX'), (800, 816, 'CO'),
+    (820, 831, 'WY'), (832, 838, 'ID'), (840, 847, 'UT'), (850, 865, 'AZ'),
+    (870, 884, 'NM'), (885, 885, 'TX'), (889, 898, 'NV'), (900, 961, 'CA'),
+    (967, 968, 'HI'), (970, 979, 'OR'), (980, 994, 'WA'), (995, 999, 'AK'),
+]
+
+ZIP_PREFIX_STATES = {
+    f"{prefix:03d}": state
+    for first, last, state in ZIP_PREFIX_RANGES
+    for prefix in range(first, last + 1)
+}
+
+STATE_NAMES = {name: abbrev for abbrev, name in US_STATES.items()}
+
+# ", AZ" followed by a space, comma or the end of the address
+ABBREV_PATTERN = re.compile(r',\s*([A-Z]{2})(?:\s|,|$)')
+
+# A ZIP (or ZIP+4) ending the address - never the leading house number
+ZIP_PATTERN = re.compile(r'\S\s.*?\b(\d{3})\d{2}(?:-\d{4})?\s*$')
+
+# Full state names after a comma, longest first so "west virginia" wins over
+# "virginia"; street names like "Texas Ave" have no comma in front
+NAME_PATTERN = re.compile(
+    r',\s*(' + '|'.join(sorted(map(re.escape, STATE_NAMES), key=len, reverse=True)) + r')\b',
+    re.IGNORECASE
+)
+
+
+class StateValidator:
+    """Check that addresses belong to the states a scraper is configured for"""
+
+    def __init__(self, scraper_name, valid_states=None, logger=None):
+        """
+        Args:
+            scraper_name: Name of scraper (e.g., 'phoenix', 'houston')
+            valid_states: Allowed state abbreviations (default: from config.json)
+            logger: Optional logger instance
+        """
+        if valid_states is None:
+            from utils import load_scraper_config
+            config = load_scraper_config()
+            if scraper_name not in config and logger:
+                logger.warning(f"No config found for {scraper_name} - skipping state validation")
+            valid_states = config.get(scraper_name, {}).get('valid_states', [])
+
+        self.scraper_name = scraper_name
+        self.valid_states = frozenset(valid_states)
+        self.logger = logger
+
+    def find_state(self, address):
+        """Return the state abbreviation an address names, or None if it cannot be told"""
+        match = ABBREV_PATTERN.search(address)
+        if match and match.group(1) in US_STATES:
+            return match.group(1)
+
+        match = ZIP_PATTERN.search(address)
+        if match and match.group(1) in ZIP_PREFIX_STATES:
+            return ZIP_PREFIX_STATES[match.group(1)]
+
+        match = NAME_PATTERN.search(address)
+        if match:
+            return STATE_NAMES[match.group(1).lower()]
+
+        return None
+
+    def mismatch(self, address):
+        """Return the wrong state found in an address, or None if it is acceptable"""
+        if not self.valid_states or not address or address == 'N/A':
+            return None  # Can't validate empty addresses
+        found_state = self.find_state(address)
+        if found_state is None or found_state in self.valid_states:
+            return None
+        return found_state
+
+    def validate(self, address):
+        """True if the address matches the expected states or cannot be determined"""
+        return self.mismatch(address) is None
+
+    def validate_many(self, addresses):
+        """
+        Validate a batch of addresses, logging one summary for all mismatches
+
+        Args:
+            addresses: Iterable of address strings
+
+        Returns:
+            (mask, summary) - a list of booleans (True = keep) in input order,
+            and a Counter of wrong state -> number of addresses discarded
+        """
+        mask = []
+        summary = Counter()
+        example = None
+
+        for address in addresses:
+            found_state = self.mismatch(address)
+            mask.append(found_state is None)
+            if found_state is not None:
+                summary[found_state] += 1
+                if example is None:
+                    example = address
+
+        if summary:
+            found = ', '.join(f"{state}: {count}" for state, count in summary.most_common())
+            message = (f"❌ STATE MISMATCH: Discarding {sum(summary.values())} permits ({found}) "
+                       f"- {self.scraper_name} expects {sorted(self.valid_states)}. e.g. '{example}'")
+            if self.logger:
+                self.logger.warning(message)
+            else:
+                print(message)
+
+        return mask, summary
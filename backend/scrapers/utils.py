@@ -12,6 +12,9 @@ import traceback
 LOG_DIR = os.path.join(os.path.dirname(__file__), '../logs')
 os.makedirs(LOG_DIR, exist_ok=True)
 
+# Per-scraper state carried between runs (high-water marks, etc.)
+STATE_DIR = os.path.join(os.path.dirname(__file__), '../state')
+
 def setup_logger(scraper_name):
     """Setup logger for a specific scraper"""
     logger = logging.getLogger(scraper_name)
@@ -44,6 +47,38 @@ def setup_logger(scraper_name):
     return logger
 
 
+def parse_retry_after(response):
+    """
+    Read a response's Retry-After header
+
+    Returns:
+        Seconds to wait (delta-seconds or HTTP-date form), or None if absent
+    """
+    from email.utils import parsedate_to_datetime
+
+    value = getattr(response, 'headers', {}).get('Retry-After') if response is not None else None
+    if not value:
+        return None
+
+    value = value.strip()
+    if value.isdigit():
+        return int(value)
+
+    try:
+        retry_at = parsedate_to_datetime(value)
+        return max(0, (retry_at - datetime.now(retry_at.tzinfo)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+
+def is_throttled(error):
+    """True if a request failed because the server asked for a pause (429, or 503 with Retry-After)"""
+    response = getattr(error, 'response', None)
+    if response is None:
+        return False
+    return response.status_code == 429 or (response.status_code == 503 and 'Retry-After' in response.headers)
+
+
 def retry_with_backoff(max_retries=3, initial_delay=1, backoff_factor=2, exceptions=(Exception,)):
     """
     Retry decorator with exponential backoff
@@ -53,6 +88,11 @@ def retry_with_backoff(max_retries=3, initial_delay=1, backoff_factor=2, excepti
         initial_delay: Initial delay in seconds
         backoff_factor: Multiplier for delay after each retry
         exceptions: Tuple of exceptions to catch and retry
+
+    If the instance has a circuit_breaker (self.circuit_breaker), every attempt
+    is reported to it, and an open circuit fails fast with CircuitOpenError
+    instead of sleeping through the remaining retries. Throttled attempts
+    (see is_throttled) only wait - they do not count as source failures.
     """
     def decorator(func):
         @wraps(func)
@@ -65,11 +105,26 @@ def retry_with_backoff(max_retries=3, initial_delay=1, backoff_factor=2, excepti
             if args and hasattr(args[0], 'logger'):
                 logger = args[0].logger
 
+            # Get circuit breaker from args if available (self.circuit_breaker)
+            breaker = getattr(args[0], 'circuit_breaker', None) if args else None
+
             for attempt in range(max_retries + 1):
+                if breaker and not breaker.allow():
+                    raise CircuitOpenError(breaker.name, breaker.last_error)
+
                 try:
-                    return func(*args, **kwargs)
+                    result = func(*args, **kwargs)
+                    if breaker:
+                        breaker.record_success()
+                    return result
                 except exceptions as e:
                     last_exception = e
+                    if breaker and is_throttled(e):
+                        breaker.record_throttled()
+                    elif breaker:
+                        breaker.record_failure(e)
+                        if breaker.state == breaker.OPEN:
+                            raise CircuitOpenError(breaker.name, breaker.last_error) from e
 
                     if attempt == max_retries:
                         if logger:
@@ -77,15 +132,18 @@ def retry_with_backoff(max_retries=3, initial_delay=1, backoff_factor=2, excepti
                             logger.debug(traceback.format_exc())
                         raise
 
+                    # A throttled request says how long to wait - never retry sooner
+                    wait = max(delay, parse_retry_after(getattr(e, 'response', None)) or 0)
+
                     if logger:
                         logger.warning(
                             f"Attempt {attempt + 1}/{max_retries + 1} failed for {func.__name__}: {e}. "
-                            f"Retrying in {delay}s..."
+                            f"Retrying in {wait}s..."
                         )
                     else:
-                        print(f"⚠️  Retry {attempt + 1}/{max_retries + 1} - waiting {delay}s...")
+                        print(f"⚠️  Retry {attempt + 1}/{max_retries + 1} - waiting {wait}s...")
 
-                    time.sleep(delay)
+                    time.sleep(wait)
                     delay *= backoff_factor
 
             raise last_exception
@@ -99,7 +157,8 @@ def safe_request(session_or_requests, url, params=None, timeout=30, max_retries=
     Make a safe HTTP request with automatic retries
 
     Args:
-        session_or_requests: requests module or requests.Session instance
+        session_or_requests: HttpClient, requests.Session, or the requests module
+                             (the module is swapped for the shared pooled client)
         url: URL to request
         params: Query parameters
         timeout: Request timeout in seconds
@@ -109,6 +168,10 @@ def safe_request(session_or_requests, url, params=None, timeout=30, max_retries=
         Response object or None if all retries failed
     """
     import requests
+    from http_client import get_http_client
+
+    if session_or_requests is None or session_or_requests is requests:
+        session_or_requests = get_http_client()
 
     for attempt in range(max_retries):
         try:
@@ -125,7 +188,7 @@ def safe_request(session_or_requests, url, params=None, timeout=30, max_retries=
                 return None
         except requests.exceptions.RequestException as e:
             if attempt < max_retries - 1:
-                wait_time = 2 ** attempt
+                wait_time = max(2 ** attempt, parse_retry_after(e.response) or 0)
                 print(f"⚠️  Request failed: {e} - retrying in {wait_time}s...")
                 time.sleep(wait_time)
             else:
@@ -154,6 +217,12 @@ class ScraperHealthCheck:
         with open(self.health_file, 'a') as f:
             f.write(f"{timestamp} | FAILURE | {str(error)[:100]}\n")
 
+    def record_circuit(self, state, reason=''):
+        """Record a circuit breaker state change"""
+        timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        with open(self.health_file, 'a') as f:
+            f.write(f"{timestamp} | CIRCUIT {state.upper()} | {str(reason)[:100]}\n")
+
     def get_last_success(self):
         """Get timestamp of last successful scrape"""
         if not os.path.exists(self.health_file):
@@ -187,6 +256,183 @@ class ScraperHealthCheck:
             return False, "Could not parse last success time"
 
 
+class CircuitOpenError(Exception):
+    """Raised instead of a request while a data source's circuit is open"""
+
+    def __init__(self, source, last_error=None):
+        self.source = source
+        self.last_error = last_error
+        super().__init__(f"Circuit open for {source} - failing fast (last error: {last_error})")
+
+
+class CircuitBreaker:
+    """
+    Per-data-source circuit breaker
+
+    Opens after failure_threshold consecutive failed requests, rejects calls
+    for cooldown seconds, then lets a single trial request through
+    (half-open): success closes the circuit, failure re-opens it.
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half-open'
+
+    def __init__(self, name, failure_threshold=3, cooldown=300, health_check=None):
+        import threading
+
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.health_check = health_check
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.last_error = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    def _set_state(self, state, reason=''):
+        """Change state and record the transition (lock held)"""
+        if state == self.state:
+            return
+        self.state = state
+        if self.health_check:
+            self.health_check.record_circuit(state, reason)
+
+    def allow(self):
+        """True if a request may be sent now"""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+
+            if self.state == self.OPEN:
+                if time.monotonic() - self.opened_at < self.cooldown:
+                    return False
+                self._set_state(self.HALF_OPEN, f"cool-down of {self.cooldown}s elapsed")
+
+            # Half-open: exactly one trial request at a time
+            if self._trial_in_flight:
+                return False
+            self._trial_in_flight = True
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self._trial_in_flight = False
+            self._set_state(self.CLOSED, 'request succeeded')
+
+    def record_throttled(self):
+        """The source asked us to back off - neither a success nor a failure"""
+        with self._lock:
+            self._trial_in_flight = False
+
+    def record_failure(self, error):
+        with self._lock:
+            self.failures += 1
+            self.last_error = str(error)[:200]
+            self._trial_in_flight = False
+
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+                self._set_state(self.OPEN, f"{self.failures} consecutive failures: {error}")
+
+
+_circuit_breakers = {}
+
+
+def get_circuit_breaker(source, **kwargs):
+    """Return the process-wide circuit breaker for a data source, creating it on first use"""
+    breaker = _circuit_breakers.get(source)
+    if breaker is None:
+        breaker = _circuit_breakers.setdefault(source, CircuitBreaker(source, **kwargs))
+    return breaker
+
+
+def write_json_atomic(path, data, indent=None):
+    """Write JSON to a temp file, then rename it into place so a crash never leaves a half-written file"""
+    import json
+
+    tmp_file = f"{path}.tmp"
+    with open(tmp_file, 'w') as f:
+        json.dump(data, f, indent=indent)
+    os.replace(tmp_file, path)
+
+
+class HighWaterMark:
+    """Persist the newest issue date (and the permit IDs seen at it) between runs"""
+
+    def __init__(self, scraper_name):
+        self.scraper_name = scraper_name
+        self.state_file = os.path.join(STATE_DIR, f'{scraper_name}_watermark.json')
+
+    def load(self):
+        """Return {'value', 'ids', 'updated'} from the last successful run, or None"""
+        import json
+
+        if not os.path.exists(self.state_file):
+            return None
+
+        try:
+            with open(self.state_file, 'r') as f:
+                mark = json.load(f)
+            if mark.get('value') is None:
+                return None
+            return mark
+        except Exception:
+            return None
+
+    def save(self, value, ids):
+        """Record the newest raw issue date value and the IDs issued at it"""
+        os.makedirs(STATE_DIR, exist_ok=True)
+        mark = {
+            'value': value,
+            'ids': sorted(ids),
+            'updated': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        }
+        write_json_atomic(self.state_file, mark)
+
+    def clear(self):
+        """Forget the mark, forcing the next run to pull the full window"""
+        if os.path.exists(self.state_file):
+            os.remove(self.state_file)
+
+
+class LearnedSelectors:
+    """Remember which selector worked for each field of a scraper, between runs"""
+
+    def __init__(self, scraper_name):
+        self.scraper_name = scraper_name
+        self.state_file = os.path.join(STATE_DIR, f'{scraper_name}_selectors.json')
+        self._selectors = None
+
+    def _load(self):
+        import json
+
+        if self._selectors is None:
+            try:
+                with open(self.state_file, 'r') as f:
+                    self._selectors = {field: tuple(sel) for field, sel in json.load(f).items()}
+            except Exception:
+                self._selectors = {}
+        return self._selectors
+
+    def get(self, field):
+        """Return the (selector_type, selector) that last worked for a field, or None"""
+        return self._load().get(field)
+
+    def remember(self, field, selector_type, selector):
+        """Record a winning selector (written only when it changes)"""
+        selectors = self._load()
+        if selectors.get(field) == (selector_type, selector):
+            return
+
+        selectors[field] = (selector_type, selector)
+        os.makedirs(STATE_DIR, exist_ok=True)
+        write_json_atomic(self.state_file, {name: list(sel) for name, sel in selectors.items()}, indent=2)
+
+
 def save_partial_results(permits, filename, scraper_name):
     """Save partial results even if scraper fails midway"""
     if not permits:
@@ -198,9 +444,10 @@ def save_partial_results(permits, filename, scraper_name):
         os.makedirs(os.path.dirname(filename), exist_ok=True)
 
         with open(filename, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.DictWriter(f, fieldnames=list(permits[0].keys()))
+            rows = [p.to_dict() if hasattr(p, 'to_dict') else p for p in permits]
+            writer = csv.DictWriter(f, fieldnames=list(rows[0].keys()))
             writer.writeheader()
-            writer.writerows(permits)
+            writer.writerows(rows)
 
         print(f"💾 Saved {len(permits)} partial results to {filename}")
         return True
@@ -209,24 +456,37 @@ def save_partial_results(permits, filename, scraper_name):
         return False
 
 
+_config_cache = {'mtime': None, 'config': None}
+
+
 def load_scraper_config():
-    """Load scraper configuration with state validation rules"""
+    """Load scraper configuration with state validation rules (re-read only when config.json changes)"""
     import json
     config_path = os.path.join(os.path.dirname(__file__), 'config.json')
 
     try:
-        with open(config_path, 'r') as f:
-            return json.load(f)
+        mtime = os.path.getmtime(config_path)
+        if _config_cache['mtime'] != mtime:
+            with open(config_path, 'r') as f:
+                _config_cache['config'] = json.load(f)
+            _config_cache['mtime'] = mtime
+        return _config_cache['config']
     except Exception as e:
         print(f"❌ Failed to load scraper config: {e}")
         return {}
 
 
+_state_validators = {}
+
+
 def validate_state(address, scraper_name, logger=None):
     """
     Validate that scraped data matches expected state for this scraper.
     This prevents data contamination (e.g., Philadelphia data in Phoenix folder).
 
+    Scrapers validating a whole page should use StateValidator.validate_many,
+    which logs one summary instead of a line per discarded permit.
+
     Args:
         address: Address string to validate
         scraper_name: Name of scraper (e.g., 'phoenix', 'houston')
@@ -235,46 +495,18 @@ def validate_state(address, scraper_name, logger=None):
     Returns:
         True if state matches or cannot be determined, False if wrong state detected
     """
-    import re
+    from state_validator import StateValidator
 
     if not address or address == 'N/A':
         return True  # Can't validate empty addresses
 
-    # Load config
-    config = load_scraper_config()
-    if scraper_name not in config:
-        if logger:
-            logger.warning(f"No config found for {scraper_name} - skipping state validation")
-        return True
-
-    valid_states = config[scraper_name].get('valid_states', [])
-    if not valid_states:
-        return True
-
-    # Extract state abbreviation from address
-    # Look for common patterns: ", AZ", " AZ ", "Arizona"
-    state_pattern = r',\s*([A-Z]{2})(?:\s|,|$)'
-    match = re.search(state_pattern, address)
-
-    if not match:
-        # Try full state names
-        state_names = {
-            'arizona': 'AZ', 'texas': 'TX', 'pennsylvania': 'PA',
-            'illinois': 'IL', 'north carolina': 'NC', 'washington': 'WA',
-            'tennessee': 'TN', 'georgia': 'GA', 'california': 'CA'
-        }
-        address_lower = address.lower()
-        for name, abbrev in state_names.items():
-            if name in address_lower:
-                found_state = abbrev
-                break
-        else:
-            return True  # Can't determine state, allow it
-    else:
-        found_state = match.group(1)
+    validator = _state_validators.get(scraper_name)
+    if validator is None:
+        validator = _state_validators.setdefault(scraper_name, StateValidator(scraper_name, logger=logger))
 
-    # Check if found state matches valid states
-    if found_state not in valid_states:
+    found_state = validator.mismatch(address)
+    if found_state is not None:
+        valid_states = sorted(validator.valid_states)
         if logger:
             logger.warning(
                 f"❌ STATE MISMATCH: Found {found_state} in address '{address}' "
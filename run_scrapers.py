@@ -1,62 +1,201 @@
 #!/usr/bin/env python3
 """
 Run all city scrapers
+
+Scrapers are loaded in-process and run concurrently on a bounded worker
+pool, so a nightly run takes roughly as long as the slowest city.
 """
 
 import os
 import sys
-import subprocess
+import time
+import logging
+import importlib
+import threading
+from queue import Queue, Empty
 from datetime import datetime
 
-def run_scraper(scraper_file):
-    """Run a single scraper"""
-    try:
-        print(f"\n{'='*50}")
-        print(f"Running {scraper_file}")
-        print(f"{'='*50}")
+ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
+SCRAPER_DIR = os.path.join(ROOT_DIR, 'backend', 'scrapers')
 
-        result = subprocess.run([
-            sys.executable,
-            os.path.join('scrapers', scraper_file)
-        ], capture_output=True, text=True, cwd=os.path.dirname(__file__))
+# Lead CSVs land here whatever directory the runner is started from
+OUTPUT_DIR = os.path.join(ROOT_DIR, 'leads')
 
-        print(result.stdout)
-        if result.stderr:
-            print("Errors:", result.stderr)
+# city key -> (module name, scraper class) inside backend/scrapers, for
+# scrapers written as code. Every city with a "source" in config.json is
+# built by engine.build_scraper and needs no entry here.
+SCRAPERS = {}
 
-        return result.returncode == 0
+MAX_WORKERS = 4
+CITY_TIMEOUT = 15 * 60  # seconds a single city may run before it is reported as timed out
 
-    except Exception as e:
-        print(f"Error running {scraper_file}: {e}")
-        return False
 
-def main():
-    """Run all scrapers"""
-    print(f"Starting scraper run at {datetime.now()}")
+def _scraper_path():
+    if SCRAPER_DIR not in sys.path:
+        sys.path.insert(0, SCRAPER_DIR)
+
+
+def available_cities():
+    """Return every city that can be scraped - config-driven and code-defined"""
+    _scraper_path()
+    engine = importlib.import_module('engine')
+    return list(dict.fromkeys(engine.configured_cities() + list(SCRAPERS)))
+
+
+def load_scraper(city):
+    """Instantiate the scraper for a city"""
+    _scraper_path()
+
+    if city in SCRAPERS:
+        module_name, class_name = SCRAPERS[city]
+        module = importlib.import_module(module_name)
+        scraper = getattr(module, class_name)()
+    else:
+        engine = importlib.import_module('engine')
+        scraper = engine.build_scraper(city)
+
+    scraper.output_dir = OUTPUT_DIR
+    return scraper
+
+
+def run_scraper(city, started):
+    """Run a single scraper in this process"""
+    started[city] = time.monotonic()
+
+    scraper = load_scraper(city)
+    permits, filepath = scraper.run()
+
+    # A complete fetch with nothing new since the last run is not a failure
+    success = filepath is not None or (not permits and getattr(scraper, 'fetch_complete', False))
+
+    return {
+        'success': success,
+        'count': len(permits),
+        'filepath': filepath,
+        'error': None if success else 'No permits scraped',
+    }
+
+
+def _worker(queue, started, finished):
+    """Run cities off the queue until it is empty, reporting each result"""
+    while True:
+        try:
+            city = queue.get_nowait()
+        except Empty:
+            return
+        try:
+            result = run_scraper(city, started)
+        except Exception as e:
+            result = {'success': False, 'count': 0, 'filepath': None, 'error': str(e)}
+        finished.put((city, result))
+
+
+def run_all(cities=None, max_workers=MAX_WORKERS, city_timeout=CITY_TIMEOUT):
+    """
+    Run scrapers concurrently and collect one result per city
 
-    scrapers = [
-        # No scrapers in frontend - all scraping done in backend
-    ]
+    Args:
+        cities: City keys to run (default: every available scraper)
+        max_workers: Maximum number of cities scraped at the same time
+        city_timeout: Seconds a city may run before it is marked as timed out
 
+    Returns:
+        Dict of city -> result dict (success, count, filepath, error, elapsed,
+        and timed_out for cities abandoned at the timeout)
+    """
+    known = available_cities()
+    cities = list(dict.fromkeys(cities or known))
     results = {}
-    for scraper in scrapers:
-        if os.path.exists(os.path.join('scrapers', scraper)):
-            results[scraper] = run_scraper(scraper)
-        else:
-            print(f"Scraper {scraper} not found")
-            results[scraper] = False
+    started = {}
 
+    for city in cities:
+        if city not in known:
+            print(f"Scraper {city} not found")
+            results[city] = {'success': False, 'count': 0, 'filepath': None,
+                             'error': 'Unknown city', 'elapsed': 0.0}
+
+    queue = Queue()
+    for city in cities:
+        if city not in results:
+            queue.put(city)
+    finished = Queue()
+
+    def start_worker():
+        # Daemon workers: a city abandoned at its timeout never holds the process open
+        threading.Thread(target=_worker, args=(queue, started, finished), daemon=True).start()
+
+    for _ in range(min(max_workers, queue.qsize())):
+        start_worker()
+
+    while len(results) < len(cities):
+        try:
+            city, result = finished.get(timeout=1)
+        except Empty:
+            city = None
+
+        if city is not None and city not in results:
+            result['elapsed'] = time.monotonic() - started.get(city, time.monotonic())
+            results[city] = result
+
+        # A worker thread cannot be killed, so an overdue city is reported and
+        # abandoned (main() exits without waiting for it), and a fresh worker
+        # takes over the rest of the queue
+        now = time.monotonic()
+        for city, since in list(started.items()):
+            if city not in results and now - since > city_timeout:
+                results[city] = {'success': False, 'count': 0, 'filepath': None,
+                                 'error': f"Timed out after {city_timeout}s",
+                                 'elapsed': now - since, 'timed_out': True}
+                if not queue.empty():
+                    start_worker()
+
+    return results
+
+
+def print_summary(results, wall_time):
+    """Print the combined run summary"""
     print(f"\n{'='*50}")
     print("SCRAPER RUN SUMMARY")
     print(f"{'='*50}")
 
-    for scraper, success in results.items():
-        status = "✓ SUCCESS" if success else "✗ FAILED"
-        print(f"{scraper}: {status}")
+    for city, result in results.items():
+        status = "✓ SUCCESS" if result['success'] else "✗ FAILED"
+        line = f"{city}: {status} - {result['count']} permits in {result['elapsed']:.1f}s"
+        if result['error'] and not result['success']:
+            line += f" ({result['error']})"
+        print(line)
 
-    successful = sum(results.values())
+    successful = sum(1 for r in results.values() if r['success'])
     total = len(results)
+    slowest = max((r['elapsed'] for r in results.values()), default=0.0)
     print(f"\nTotal: {successful}/{total} scrapers successful")
+    print(f"Wall time: {wall_time:.1f}s (slowest city: {slowest:.1f}s)")
+
+
+def main():
+    """Run all scrapers"""
+    print(f"Starting scraper run at {datetime.now()}")
+
+    cities = sys.argv[1:] or None
+    start = time.monotonic()
+    results = run_all(cities)
+    print_summary(results, time.monotonic() - start)
+
+    code = 0 if results and all(r['success'] for r in results.values()) else 1
+
+    if any(r.get('timed_out') for r in results.values()):
+        # Abandoned cities may still be inside fetch thread pools, which the
+        # interpreter joins at exit - close shared resources and leave now
+        driver_pool = sys.modules.get('driver_pool')
+        if driver_pool is not None:
+            driver_pool.close_driver_pools()
+        logging.shutdown()
+        sys.stdout.flush()
+        sys.stderr.flush()
+        os._exit(code)
+
+    return code
+
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(main())